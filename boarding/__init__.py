@@ -0,0 +1,33 @@
+# BOARDING
+# Simulates the process of boarding a plane.
+
+# The package can be imported (and planes boarded) without a display: nothing here imports tkinter or pandas, and the
+# modules a boarding needs are only imported once simulate is first called, so a short-lived worker process starts fast.
+#
+#     import boarding
+#     result = boarding.simulate(strategy = "wilma", seed = 3)
+#     print(result["ticks"], result["seconds"])
+
+
+# SIMULATE
+##################################################
+# board a plane once, headlessly
+# layout is a list of (section, seat_layout, n_rows, leg_room, seat_depth) (see plane.default_layout), the plane is built
+# once per process for every layout; the passengers of seed (see population.py) board with a strategy (see strategies.py),
+# or, given zones, in those zones, in the order they show up; the remaining parameters are as in plane.plane and monte_carlo.board_once
+# returns {"ticks": how long boarding took, "seconds": the same in seconds, "stalled": the watchdog's report, or None if boarding finished}
+
+def simulate(layout = None, strategy = "front_to_back", seed = 0, zones = None, parameters = {}, n_exits = 1, door_assignment = "nearest", max_steps = 1, walking_speed = 1.0,
+             vectorized_ticks = False, discrete_events = False, release = None, release_values = (), max_ticks = None, max_seconds = None, traits = {}):
+    from boarding import plane, monte_carlo
+    from boarding.watchdog import stalled
+    airplane = plane.build_plane(layout = layout if layout is not None else plane.default_layout, n_exits = n_exits, max_steps = max_steps, walking_speed = walking_speed, door_assignment = door_assignment)
+    try:
+        ticks = monte_carlo.board_once(cabin = airplane.cabin, zones = zones, seed = seed, vectorized_ticks = vectorized_ticks, strategy = strategy if zones is None else None, parameters = parameters,
+                                       discrete_events = discrete_events, max_ticks = max_ticks, max_seconds = max_seconds, release = release, release_values = release_values, traits = traits)
+        report = None
+    except stalled as stall:
+        ticks, report = float("nan"), stall.report
+    return({"ticks": ticks, "seconds": ticks * airplane.cabin.tick_seconds, "stalled": report})
+
+##################################################
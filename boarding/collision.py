@@ -0,0 +1,258 @@
+# COLLISION
+# Data structures that answer "is anything in the way?" without asking a canvas.
+
+
+# IMPORTS
+##################################################
+
+from math import floor # for grid cells
+from math import hypot # for distances
+import numpy # for the occupancy mask
+from itertools import product # for buckets of segments
+
+##################################################
+
+# HELPER FUNCTIONS
+##################################################
+
+# distance from a point to each of many line segments, where segments = [[x_start, y_start, x_end, y_end], ...]
+def point_segment_distances(point, segments):
+    point = numpy.array(point, dtype = "float64")
+    starts, ends = segments[:, :2], segments[:, 2:]
+    direction = ends - starts
+    length_squared = numpy.sum(direction ** 2, axis = 1)
+    length_squared[length_squared == 0] = 1 # degenerate segments are just points
+    t = numpy.clip(numpy.sum((point - starts) * direction, axis = 1) / length_squared, a_min = 0, a_max = 1) # where along each segment the closest point is
+    closest = starts + (t[:, numpy.newaxis] * direction)
+    return(numpy.hypot(point[0] - closest[:, 0], point[1] - closest[:, 1]))
+
+##################################################
+
+
+# SPATIAL HASH
+##################################################
+# uniform grid of (moving) discs, where each disc is filed under the cell its center is in
+# with cells about one passenger diameter wide, a neighbour query only has to look at a handful of cells,
+# no matter how many passengers there are in the plane
+# ex. # index = spatial_hash(cell_size = passenger_diameter); index.insert(item = Phil, position = (0, 0))
+
+class spatial_hash:
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {} # (i, j) -> set of items in that cell
+        self.positions = {} # item -> (x, y)
+        self.item_cells = {} # item -> (i, j)
+
+    # which cell a point is in
+    def cell(self, position):
+        return((floor(position[0] / self.cell_size), floor(position[1] / self.cell_size)))
+
+    # number of items in the index
+    def __len__(self):
+        return(len(self.positions))
+
+    # add an item
+    def insert(self, item, position):
+        cell = self.cell(position = position)
+        self.cells.setdefault(cell, set()).add(item)
+        self.positions[item] = (position[0], position[1])
+        self.item_cells[item] = cell
+
+    # remove an item
+    def remove(self, item):
+        cell = self.item_cells.pop(item)
+        del self.positions[item]
+        self.cells[cell].discard(item)
+        if len(self.cells[cell]) == 0:
+            del self.cells[cell]
+
+    # update the position of an item, only touching the grid if it crossed into another cell
+    def move(self, item, position):
+        cell = self.cell(position = position)
+        if cell != self.item_cells[item]:
+            self.remove(item = item)
+            self.insert(item = item, position = position)
+        else:
+            self.positions[item] = (position[0], position[1])
+
+    # all items whose centers are closer than distance to position
+    def neighbours(self, position, distance, exclude = None):
+        x, y = position
+        i_min, j_min = self.cell(position = (x - distance, y - distance))
+        i_max, j_max = self.cell(position = (x + distance, y + distance))
+        neighbours = []
+        for i in range(i_min, i_max + 1):
+            for j in range(j_min, j_max + 1):
+                for item in self.cells.get((i, j), ()):
+                    if item is exclude:
+                        continue
+                    x_item, y_item = self.positions[item]
+                    if hypot(x_item - x, y_item - y) < distance:
+                        neighbours.append(item)
+        return(neighbours)
+
+    # any one item whose center is closer than distance to position, or None if there isn't one
+    def first(self, position, distance, exclude = None):
+        x, y = position
+        i_min, j_min = self.cell(position = (x - distance, y - distance))
+        i_max, j_max = self.cell(position = (x + distance, y + distance))
+        for i in range(i_min, i_max + 1):
+            for j in range(j_min, j_max + 1):
+                for item in self.cells.get((i, j), ()):
+                    if item is exclude:
+                        continue
+                    x_item, y_item = self.positions[item]
+                    if hypot(x_item - x, y_item - y) < distance:
+                        return(item)
+        return(None)
+
+    # is there any item whose center is closer than distance to position?
+    def occupied(self, position, distance, exclude = None):
+        return(self.first(position = position, distance = distance, exclude = exclude) is not None)
+
+##################################################
+
+
+# OCCUPANCY MASK
+##################################################
+# static obstacles (walls, arm/backrests) rasterized once per layout
+# every cell of a fine grid (resolution = cell width, well under a passenger radius) is marked by where a passenger's CENTER can be:
+#   blocked: a passenger centered anywhere in this cell would overlap an obstacle
+#   clear: a passenger centered anywhere in this cell is free of every obstacle
+# the few cells that are neither (right along the edge of an obstacle) fall back to an exact test against the nearby segments,
+# so the answer is the same as testing against every segment, but usually costs one array lookup
+# ex. # obstacles = occupancy_mask(segments = wall_segments, half_widths = wall_half_widths, reach = passenger_radius, resolution = passenger_radius / 8)
+
+class occupancy_mask:
+
+    def __init__(self, segments, half_widths, reach, resolution):
+        self.segments = numpy.array(segments, dtype = "float64").reshape(-1, 4)
+        self.half_widths = numpy.array(half_widths, dtype = "float64").reshape(-1)
+        self.reach = reach # how far an obstacle has to be from a passenger's center to not touch them
+        self.resolution = resolution
+        half_diagonal = resolution / numpy.sqrt(2) # furthest a point in a cell can be from the cell's center
+
+        # grid covers every segment plus however far away it can be felt
+        inflation = (self.half_widths + reach + half_diagonal)[:, numpy.newaxis] if len(self.segments) > 0 else numpy.zeros(shape = (0, 1))
+        lower = numpy.minimum(self.segments[:, :2], self.segments[:, 2:]) - inflation # top left of each segment's area of influence
+        upper = numpy.maximum(self.segments[:, :2], self.segments[:, 2:]) + inflation # bottom right
+        self.origin = lower.min(axis = 0) if len(self.segments) > 0 else numpy.zeros(shape = 2)
+        self.shape = tuple(numpy.ceil(((upper.max(axis = 0) if len(self.segments) > 0 else self.origin) - self.origin) / resolution).astype("int64") + 1)
+
+        # clearance of every cell center, that is, the distance to the surface of the closest obstacle
+        clearance = numpy.full(shape = self.shape, fill_value = numpy.inf)
+        first_cells = numpy.floor((lower - self.origin) / resolution).astype("int64")
+        last_cells = numpy.floor((upper - self.origin) / resolution).astype("int64")
+        self.buckets = {} # coarse cell -> indicies of segments that can be felt there, for the exact fallback
+        self.bucket_size = 8 # in cells
+        for k, segment in enumerate(self.segments):
+            (i_first, j_first), (i_last, j_last) = first_cells[k], last_cells[k]
+            x = self.origin[0] + ((numpy.arange(i_first, i_last + 1) + 0.5) * resolution) # cell centers
+            y = self.origin[1] + ((numpy.arange(j_first, j_last + 1) + 0.5) * resolution)
+            x, y = numpy.meshgrid(x, y, indexing = "ij")
+            start, direction = segment[:2], segment[2:] - segment[:2]
+            length_squared = numpy.sum(direction ** 2) if numpy.sum(direction ** 2) != 0 else 1
+            t = numpy.clip((((x - start[0]) * direction[0]) + ((y - start[1]) * direction[1])) / length_squared, a_min = 0, a_max = 1)
+            distances = numpy.hypot(x - (start[0] + (t * direction[0])), y - (start[1] + (t * direction[1]))) - self.half_widths[k]
+            window = clearance[i_first:(i_last + 1), j_first:(j_last + 1)]
+            numpy.minimum(window, distances, out = window)
+            for bucket in product(range(i_first // self.bucket_size, (i_last // self.bucket_size) + 1), range(j_first // self.bucket_size, (j_last // self.bucket_size) + 1)):
+                self.buckets.setdefault(bucket, []).append(k)
+        self.buckets = {bucket: numpy.array(indicies, dtype = "int64") for bucket, indicies in self.buckets.items()}
+
+        # classify cells
+        self.blocked = clearance < (reach - half_diagonal)
+        self.clear = clearance >= (reach + half_diagonal)
+
+    # does a passenger centered at point overlap an obstacle?
+    def collides(self, point):
+        i = floor((point[0] - self.origin[0]) / self.resolution)
+        j = floor((point[1] - self.origin[1]) / self.resolution)
+        if not (0 <= i < self.shape[0] and 0 <= j < self.shape[1]): # outside of the grid, there are no obstacles
+            return(False)
+        if self.clear[i, j]:
+            return(False)
+        if self.blocked[i, j]:
+            return(True)
+        # along the edge of an obstacle, test exactly
+        nearby = self.buckets.get((i // self.bucket_size, j // self.bucket_size))
+        if nearby is None:
+            return(False)
+        return(bool(numpy.any(point_segment_distances(point = point, segments = self.segments[nearby]) < self.reach + self.half_widths[nearby])))
+
+    # does a passenger centered at each of points = [[x, y], ...] overlap an obstacle?
+    def collides_many(self, points):
+        points = numpy.array(points, dtype = "float64").reshape(-1, 2)
+        i = numpy.floor((points[:, 0] - self.origin[0]) / self.resolution).astype("int64")
+        j = numpy.floor((points[:, 1] - self.origin[1]) / self.resolution).astype("int64")
+        inside = (0 <= i) & (i < self.shape[0]) & (0 <= j) & (j < self.shape[1])
+        i, j = numpy.where(inside, i, 0), numpy.where(inside, j, 0)
+        collisions = inside & self.blocked[i, j]
+        # along the edge of an obstacle, test exactly
+        for k in numpy.flatnonzero(inside & ~self.clear[i, j] & ~self.blocked[i, j]):
+            collisions[k] = self.collides(point = points[k])
+        return(collisions)
+
+##################################################
+
+
+# QUEUE SLOTS
+##################################################
+# the places passengers line up in the boarding queue (slots, front of the queue first), and who is in each of them
+# slots are on a regular grid, far enough apart that a passenger can only ever be in the one closest to them, so
+# keeping track of a passenger is a rounding and a distance per move, and whether a slot is free is one counter
+# ex. # queue = queue_slots(slots = spawning_locs, distance = 2 * passenger_radius); queue.update(item = Phil, position = (0, 0))
+
+class queue_slots:
+
+    def __init__(self, slots, distance, blocked = None):
+        self.slots = numpy.array(slots, dtype = "float64").reshape(-1, 2)
+        self.points = tuple(map(tuple, self.slots.tolist())) # same as slots, quicker to look at one at a time
+        self.distance = distance # how close a center has to be to a slot to be in it
+        self.spacing = float(numpy.min(numpy.hypot(*numpy.diff(self.slots, axis = 0).T))) if len(self.slots) > 1 else 2 * distance # distance between neighbouring slots
+        self.origin = self.points[0] if len(self.points) > 0 else (0.0, 0.0)
+
+        # grid cell -> slot
+        cells = numpy.round((self.slots - self.origin) / self.spacing)
+        if not numpy.allclose(numpy.array(self.origin) + (cells * self.spacing), self.slots) or len(set(map(tuple, cells))) < len(self.slots):
+            raise Exception("queue exception: The slots of the boarding queue need to be on a regular grid.")
+        if distance > self.spacing / 2:
+            raise Exception("queue exception: The slots of the boarding queue are too close together for a passenger to only be in one at a time.")
+        self.cells = dict(((tuple(map(int, cell)), i) for i, cell in enumerate(cells)))
+
+        # occupants of every slot; slots that are blocked (e.g. by a wall) count as occupied for good
+        self.blocked = tuple(bool(blocked is not None and blocked[i]) for i in range(len(self.slots)))
+        self.occupants = [0, ] * len(self.slots)
+        self.item_slots = {} # item -> the slot it is in
+
+    # which slot a passenger centered at position is in, or None
+    def slot(self, position):
+        i = self.cells.get((round((position[0] - self.origin[0]) / self.spacing), round((position[1] - self.origin[1]) / self.spacing)))
+        if i is not None and hypot(self.points[i][0] - position[0], self.points[i][1] - position[1]) < self.distance:
+            return(i)
+        return(None)
+
+    # an item is now at position
+    def update(self, item, position):
+        previous, current = self.item_slots.get(item), self.slot(position = position)
+        if previous != current:
+            if previous is not None:
+                self.occupants[previous] -= 1
+                del self.item_slots[item]
+            if current is not None:
+                self.occupants[current] += 1
+                self.item_slots[item] = current
+
+    # is anyone in slot i?
+    def occupied(self, i):
+        return(self.blocked[i] or self.occupants[i] > 0)
+
+    # the first slot behind the last one anybody is in (the back of the line), or 0 if nobody is in the queue
+    def behind(self):
+        for i in range(len(self.occupants) - 1, -1, -1):
+            if self.occupants[i] > 0:
+                return(min(i + 1, len(self.occupants) - 1))
+        return(0)
+
+##################################################
@@ -0,0 +1,219 @@
+# DISCRETE
+# Discrete-event boarding simulation, with every walkway as a queue of row slots.
+
+# Instead of moving passengers a step at a time, every walkway is a line of slots one passenger diameter wide, from
+# the first row to the last (every row's leg room is one of the slots), and every door is one more slot that every walkway
+# shares, with a line of its own in front of it. A passenger holds exactly one slot at a time, and only four things ever happen, each an event on a heap ordered by time:
+#    advance: a passenger arrives in the next slot toward their row (or waits until it is free)
+#    stow: a passenger at their row has stowed their luggage
+#    shuffle: passengers already seated between them and the walkway have let them through
+#    sit: the passenger is in their seat, and leaves the walkway
+# Time is measured in ticks, worked out from the plane's geometry (distance / stride), so boarding times can be set side by side
+# with engine.simulation's. By default there is no luggage and seated passengers are no obstacle, like the agent model,
+# so a boarding of a few hundred passengers takes milliseconds: good for screening strategies before looking at them in detail.
+# Given a population (see population.py), every passenger also takes their own time to stow their luggage, and walks at their own pace.
+# Passengers from different doors can be headed toward each other down the same stretch of walkway (for instance when
+# rows aren't boarded through the door nearest to them), and nobody can squeeze past anybody in a slot one passenger wide.
+# So before stepping off their door, every passenger claims the slots from their door to their row, and waits at the door
+# while anyone headed the other way has a claim on any of them; a claim is given up once its passenger sits down.
+# Every event happens once, so boarding always ends: if it runs out of events with passengers still standing, nobody can
+# ever move again, and it raises watchdog.stalled with a report of who is stuck, like the other engines.
+
+
+# IMPORTS
+##################################################
+
+import numpy # for slot positions
+from heapq import heappush, heappop # for the event scheduler
+from collections import deque # for the lines at the doors
+from itertools import count # for breaking ties between events
+from time import perf_counter # for the watchdog's report
+from boarding.watchdog import stalled, blocking_cycle # for boardings that can't finish
+
+##################################################
+
+
+# SIMULATION
+##################################################
+# one boarding of one plane, same interface as engine.simulation (without an observer)
+# stow_ticks is how long stowing luggage takes, shuffle_ticks how long each seated passenger in the way takes to let someone through,
+# and sit_ticks how long getting out of the walkway takes (by default, one passenger diameter's worth of steps);
+# population adds every passenger's own luggage time to stow_ticks, and divides every walk by their pace
+# ex. # ticks = simulation(cabin = cabin, stow_ticks = 20).run(zones = [seat_list[:20], seat_list[20:40], ...])
+
+class simulation:
+
+    def __init__(self, cabin, stow_ticks = 0.0, shuffle_ticks = 0.0, sit_ticks = None, population = None):
+        self.cabin = cabin
+        self.population = population
+        self.stow_ticks = stow_ticks
+        self.shuffle_ticks = shuffle_ticks
+        self.sit_ticks = sit_ticks if sit_ticks is not None else (2 * cabin.passenger_radius) / cabin.stride
+        self.seated = set() # seats taken in earlier zones
+        self.ticks = 0.0 # time since boarding began
+        self.zone = 0 # zone boarding
+
+        # slots, front to back, and which slot the leg room of each row is; every door is between the slots in front of it and the slots behind it
+        diameter = 2 * cabin.passenger_radius
+        x_front, x_back = min(cabin.row_x.values()), max(cabin.row_x.values())
+        self.slot_x = x_front + (diameter * numpy.arange(int(round((x_back - x_front) / diameter)) + 1))
+        self.slot_of_row = dict(((row, int(round((x - x_front) / diameter))) for row, x in cabin.row_x.items()))
+        self.door_y = [door.spawning_locs[0][1] for door in cabin.doors] # front of every door's boarding queue
+        self.door_slots = [int(numpy.searchsorted(self.slot_x, door.x)) for door in cabin.doors] # first slot behind every door
+        self.spacing_ticks = diameter / cabin.stride # how long until the next passenger in line is where the last one was
+
+        # seats between each seat and the walkway it is boarded from
+        self.between = {}
+        for seat in cabin.seat_list:
+            row, letter = int(seat[:-1]), seat[-1]
+            seat_layout = cabin.section_layouts[cabin.which_section(row_number = row)]
+            walkway = [i for i, character in enumerate(seat_layout) if character == " "][cabin.seat_walkways[seat]]
+            position = seat_layout.index(letter)
+            self.between[seat] = tuple(f"{row}{other}" for other in seat_layout[(min(position, walkway) + 1):max(position, walkway)] if other != " ")
+
+    # BOARDING
+    ##############################################
+
+    # board a zone of passengers, returns once all of them are in their seats
+    def board(self, seats):
+        cabin, stride = self.cabin, self.cabin.stride
+        n = len(seats)
+        self.zone += 1
+        started = perf_counter()
+
+        # every passenger's door, walkway, slot of their row, and direction from their door (+1 = toward the back)
+        doors = [cabin.seat_doors[seat] for seat in seats]
+        walkways = [cabin.seat_walkways[seat] for seat in seats]
+        targets = [self.slot_of_row[int(seat[:-1])] for seat in seats]
+        directions = [1 if target >= self.door_slots[door] else -1 for target, door in zip(targets, doors)]
+        entryways = [cabin.routes[(seat, walkway)][0] for seat, walkway in zip(seats, walkways)] # first point on the plane
+        paces = [self.population.pace[seat] for seat in seats] if self.population is not None else [1.0, ] * n # multiple of the walking speed
+        luggage = [self.population.luggage_ticks[seat] for seat in seats] if self.population is not None else [0.0, ] * n # time to stow on top of stow_ticks
+
+        locations = [None, ] * n # ("door", door), (walkway, slot), or None (outside or seated)
+        occupants = {} # location -> passenger holding it
+        waiting = {} # location -> passengers waiting for it to be free, first come first served
+        claims = {} # passenger -> (walkway, first slot, last slot, direction) of the stretch of walkway they are on their way through
+        crossing = [] # passengers at their door, waiting for passengers headed the other way to clear their stretch of walkway
+        lines = [deque(k for k in range(n) if doors[k] == door) for door in range(len(cabin.doors))] # passengers not yet on the plane at every door, in boarding order
+        firsts = set(line[0] for line in lines if len(line) > 0) # the first passenger through every door
+        events, order = [], count() # heap of (time, tie breaker, event, passenger)
+        remaining = n
+
+        # how long going from one location to the next takes
+        def travel(k, previous, location):
+            if location[0] == "door": # the first passenger walks from the front of the boarding queue to the walkway, the rest are right behind
+                return((abs(entryways[k][1] - self.door_y[location[1]]) / stride if k in firsts else self.spacing_ticks) / paces[k])
+            x_previous = entryways[k][0] if previous[0] == "door" else self.slot_x[previous[1]]
+            return(abs(self.slot_x[location[1]] - x_previous) / (stride * paces[k]))
+
+        # passenger k takes location now, giving up the one they were in
+        def move(k, location, time):
+            previous = locations[k]
+            occupants[location] = k
+            locations[k] = location
+            heappush(events, (time + travel(k = k, previous = previous, location = location), next(order), "advance", k))
+            if previous is not None:
+                release(location = previous, time = time)
+
+        # location is free, let the next passenger in
+        def release(location, time):
+            del occupants[location]
+            if location in waiting:
+                k = waiting[location].popleft()
+                if len(waiting[location]) == 0:
+                    del waiting[location]
+                move(k = k, location = location, time = time)
+            elif location[0] == "door" and len(lines[location[1]]) > 0:
+                move(k = lines[location[1]].popleft(), location = location, time = time)
+
+        # passenger k claims the slots from their door to their row, unless someone headed the other way has a claim on any of them
+        def claim(k):
+            door_slot = self.door_slots[doors[k]]
+            walkway, first, last, direction = (walkways[k], door_slot, targets[k], 1) if directions[k] == 1 else (walkways[k], targets[k], door_slot - 1, -1)
+            if any(other[0] == walkway and other[3] != direction and other[1] <= last and first <= other[2] for other in claims.values()):
+                return(False)
+            claims[k] = (walkway, first, last, direction)
+            return(True)
+
+        for door, line in enumerate(lines):
+            if len(line) > 0:
+                move(k = line.popleft(), location = ("door", door), time = self.ticks)
+        time = self.ticks
+        while remaining > 0:
+            if len(events) == 0: # everyone left is waiting for someone else
+                self.ticks = time
+                raise stalled(report = self.describe(seats = seats, locations = locations, targets = targets, entryways = entryways, occupants = occupants, waiting = waiting, claims = claims, crossing = crossing, seconds = perf_counter() - started))
+            time, _, event, k = heappop(events)
+
+            if event == "advance":
+                location = locations[k]
+                if location[0] != "door" and location[1] == targets[k]: # at their row
+                    heappush(events, (time + self.stow_ticks + luggage[k], next(order), "stow", k))
+                    continue
+                if location[0] == "door":
+                    if k not in claims and not claim(k = k):
+                        crossing.append(k) # try again once someone gives up their claim
+                        continue
+                    door_slot = self.door_slots[location[1]]
+                    next_location = (walkways[k], door_slot if directions[k] == 1 else door_slot - 1)
+                else:
+                    next_location = (walkways[k], location[1] + directions[k])
+                if next_location in occupants:
+                    waiting.setdefault(next_location, deque()).append(k) # try again once it is free
+                else:
+                    move(k = k, location = next_location, time = time)
+
+            elif event == "stow": # everyone seated between them and the walkway has to get up
+                blockers = sum(seat in self.seated for seat in self.between[seats[k]])
+                heappush(events, (time + (blockers * self.shuffle_ticks), next(order), "shuffle", k))
+
+            elif event == "shuffle":
+                heappush(events, (time + self.sit_ticks, next(order), "sit", k))
+
+            elif event == "sit":
+                self.seated.add(seats[k])
+                location, locations[k] = locations[k], None
+                release(location = location, time = time)
+                remaining -= 1
+                del claims[k]
+                for other in list(crossing): # their way might be clear now
+                    if claim(k = other):
+                        crossing.remove(other)
+                        heappush(events, (time, next(order), "advance", other))
+
+        self.ticks = time
+        return(self.ticks)
+
+    # where boarding is stuck, for the watchdog's report (see watchdog.stalled): every passenger standing, and who they are waiting for
+    def describe(self, seats, locations, targets, entryways, occupants, waiting, claims, crossing, seconds):
+        blocked_by = {}
+        for location, waiters in waiting.items():
+            for k in waiters:
+                blocked_by[k] = [occupants[location], ]
+        for k in crossing: # held up by everyone headed the other way down the same stretch of walkway
+            door_slot = self.door_slots[self.cabin.seat_doors[seats[k]]]
+            walkway, first, last = self.cabin.seat_walkways[seats[k]], min(door_slot, targets[k]), max(door_slot - 1, targets[k])
+            blocked_by[k] = [other for other, (other_walkway, other_first, other_last, _) in claims.items() if other != k and other_walkway == walkway and other_first <= last and first <= other_last]
+        standing = [k for k, location in enumerate(locations) if location is not None]
+        coords = lambda k, location: tuple(self.cabin.doors[location[1]].spawning_locs[0]) if location[0] == "door" else (float(self.slot_x[location[1]]), float(entryways[k][1]))
+        return({
+            "reason" : "deadlock",
+            "ticks"  : self.ticks,
+            "seconds": seconds,
+            "zone"   : self.zone,
+            "seated" : len(self.seated),
+            "waiting": sum(location is None and seats[k] not in self.seated for k, location in enumerate(locations)),
+            "stuck"  : [{"seat": seats[k], "coords": coords(k = k, location = locations[k]), "target": (float(self.slot_x[targets[k]]), float(entryways[k][1])), "blocked_by": [seats[other] for other in blocked_by.get(k, ())]} for k in standing],
+            "cycle"  : blocking_cycle(blocked_by = {seats[k]: [seats[other] for other in blocked_by.get(k, ())] for k in standing})
+            })
+
+    # board zone after zone, zones = [[seat, seat, ...], [seat, ...], ...]; returns total number of ticks
+    def run(self, zones):
+        for seats in zones:
+            self.board(seats = seats)
+        return(self.ticks)
+
+    ##############################################
+
+##################################################
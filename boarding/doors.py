@@ -0,0 +1,59 @@
+# DOORS
+# Which door every row boards through.
+
+# A plane with more than one exit (see n_exits) boards through all of them at once, every door with a boarding queue
+# of its own. A door assignment is a function assignment(row_x, row_seats, door_x) that returns {row: door}, where
+# row_x = {row: x} is where every row is, row_seats = {row: n} how many seats it has, and door_x = [x, ...] where every
+# door is, front to back (door 0 is the front door). Door assignments are kept in the assignments dictionary by name,
+# like strategies (see strategies.py):
+#
+#     from boarding.doors import register
+#     @register("odd_rows_in_front")
+#     def odd_rows_in_front(row_x, row_seats, door_x):
+#         return({row: (0 if row % 2 == 1 else len(door_x) - 1) for row in row_x})
+
+
+# REGISTRY
+##################################################
+
+assignments = {} # name -> door assignment function
+
+# decorator to add a door assignment to the registry
+def register(name):
+    def add_to_registry(assignment):
+        assignments[name] = assignment
+        return(assignment)
+    return(add_to_registry)
+
+# the door of every row, by the name of a door assignment
+def assign_doors(name, row_x, row_seats, door_x):
+    if name not in assignments:
+        raise Exception(f"door exception: There is no door assignment called {name}. The door assignments are: {', '.join(assignments.keys())}.")
+    return(assignments[name](row_x = row_x, row_seats = row_seats, door_x = door_x))
+
+##################################################
+
+
+# DOOR ASSIGNMENTS
+##################################################
+
+# everyone boards through the front door
+@register("front")
+def front(row_x, row_seats, door_x):
+    return({row: 0 for row in row_x})
+
+# every row boards through the door closest to it (the default)
+@register("nearest")
+def nearest(row_x, row_seats, door_x):
+    return({row: min(range(len(door_x)), key = lambda door: abs(x - door_x[door])) for row, x in row_x.items()})
+
+# rows are split front to back so that every door boards about as many passengers
+@register("balanced")
+def balanced(row_x, row_seats, door_x):
+    total, seats_before, doors = sum(row_seats.values()), 0, {}
+    for row in sorted(row_x.keys(), key = lambda row: row_x[row]):
+        doors[row] = min((len(door_x) * seats_before) // max(total, 1), len(door_x) - 1)
+        seats_before += row_seats[row]
+    return(doors)
+
+##################################################
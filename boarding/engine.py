@@ -0,0 +1,548 @@
+# ENGINE
+# Headless boarding simulation.
+
+# Passenger and plane state live in plain Python/NumPy structures here, so a whole
+# boarding can run without a display. The tkinter window in airplane_boarding.py is an
+# optional viewer on top of this engine: it is told when passengers spawn and move.
+
+
+# IMPORTS
+##################################################
+
+import numpy # for positions and wall segments
+from math import hypot # for distances
+from boarding.collision import spatial_hash # for finding nearby passengers
+from boarding.collision import queue_slots # for who is where in the boarding queue
+from collections import deque # for passengers waiting to spawn
+from boarding.collision import occupancy_mask # for walls and arm/backrests
+from boarding.watchdog import watchdog # for stopping boardings that can't finish
+from boarding.release import barrier # for calling zones to the boarding queue
+from boarding.doors import assign_doors # for which door every row boards through
+from itertools import accumulate # for where zones end
+
+##################################################
+
+
+# DOOR
+##################################################
+# a door passengers board through, and the boarding queue in front of it: spawning_locs, a snake nrow_spawnpoints long,
+# starting at the front of the queue, whose x is where passengers go through the door
+# obstacles is the cabin's occupancy mask, for spawning locations no passenger fits in
+
+class door:
+
+    def __init__(self, spawning_locs, nrow_spawnpoints, obstacles):
+        self.spawning_locs = tuple(map(tuple, spawning_locs))
+        self.nrow_spawnpoints = nrow_spawnpoints
+        self.x = self.spawning_locs[0][0] # where passengers go through the door
+        self.blocked = tuple(obstacles.collides(point = location) for location in self.spawning_locs) # spawning locations no passenger fits in
+        self.queue_routes = tuple(self.queue_route(spawnpoint_index = i) for i in range(len(self.spawning_locs))) # spawnpoint_index -> points
+
+    # corners of the boarding queue between spawnpoint_index and the front of the queue (the last corner is left out, since the door is straight ahead of it)
+    def queue_route(self, spawnpoint_index):
+        spawning_locs, nrow_spawnpoints = self.spawning_locs, self.nrow_spawnpoints
+        corners = sorted(list(range(0, spawnpoint_index, nrow_spawnpoints)) + list(range(nrow_spawnpoints - 1, spawnpoint_index, nrow_spawnpoints)))
+        corners = list((tuple(spawning_locs[i]) for i in corners))[::-1]
+        return(tuple(corners[:-1]))
+
+##################################################
+
+
+# CABIN
+##################################################
+# the static geometry of the plane that passengers need to know about
+# walls = [(vertices, width), ...], polylines that passengers can't walk through (walls, arm/backrests)
+# seat_coordinates = {"27C": (x, y), ...}; row_x = {27: x, ...}, the middle of the leg room in front of each row
+# spawning_locs and nrow_spawnpoints are the boarding queue of the front door; doors = [(spawning_locs, nrow_spawnpoints), ...] are those of
+# every other door passengers board through, front to back, and door_assignment (see doors.py) says which door every row boards through
+
+class cabin:
+
+    def __init__(self, passenger_radius, step, bounding_box_margin, walls, spawning_locs, nrow_spawnpoints,
+                 sections, section_row_numbers, section_layouts, has_first_class, n_walkways,
+                 x_walkways, y_walkways, row_x, seat_coordinates, max_steps = 1, walking_speed = 1.0,
+                 doors = (), door_assignment = "nearest", key = None):
+
+        self.key = key # identifies the plane the cabin was built from, so boarding times can be stored (see results.py)
+
+        # passenger dimensions
+        self.passenger_radius = passenger_radius
+        self.step = step # step size of passengers
+        self.bounding_box_margin = bounding_box_margin
+
+        # passenger speed: a passenger in free space gets up to max_steps steps further every tick, and walks walking_speed passenger diameters per second,
+        # so a tick lasts however long walking a stride takes, and boarding times with different max_steps are comparable in seconds
+        self.max_steps = max(1, int(max_steps))
+        self.stride = self.max_steps * step # furthest a passenger can get in one tick
+        self.walking_speed = walking_speed
+        self.tick_seconds = self.stride / (walking_speed * 2 * passenger_radius) # how long a tick lasts (in seconds)
+
+        # break every wall polyline into segments
+        segments, half_widths = [], []
+        for vertices, width in walls:
+            vertices = numpy.array(vertices, dtype = "float64").reshape(-1, 2)
+            segments.append(numpy.concatenate((vertices[:-1], vertices[1:]), axis = 1))
+            half_widths.append(numpy.full(shape = len(vertices) - 1, fill_value = width / 2))
+        self.wall_segments = numpy.concatenate(segments, axis = 0) if segments else numpy.zeros(shape = (0, 4))
+        self.wall_half_widths = numpy.concatenate(half_widths, axis = 0) if half_widths else numpy.zeros(shape = 0)
+
+        # the walls never move, so rasterize them once into where passengers can and can't stand
+        self.obstacles = occupancy_mask(segments = self.wall_segments, half_widths = self.wall_half_widths, reach = passenger_radius + bounding_box_margin, resolution = passenger_radius / 8)
+
+        # spawning mechanics, the front door first
+        self.doors = tuple(door(spawning_locs = locs, nrow_spawnpoints = n, obstacles = self.obstacles) for locs, n in [(spawning_locs, nrow_spawnpoints), ] + list(doors))
+        self.spawning_locs = self.doors[0].spawning_locs # the front door's boarding queue
+        self.nrow_spawnpoints = nrow_spawnpoints
+
+        # sections and walkways
+        self.sections = list(sections)
+        self.section_row_numbers = list(section_row_numbers) # last row number of each section
+        self.section_layouts = dict(section_layouts) # seat layout of each section, like "AB CD EF", spaces are walkways
+        self.section_seats = dict(((section, "".join(self.section_layouts[section].split())) for section in self.section_layouts)) # seat letters of each section, from left to right
+        self.has_first_class = has_first_class
+        self.n_walkways = n_walkways
+        self.x_walkways = dict(x_walkways)
+        self.y_walkways = {section: list(y_walkways[section]) for section in y_walkways}
+
+        # rows and seats
+        self.row_x = dict(row_x)
+        self.seat_coordinates = dict(seat_coordinates)
+        self.seat_list = list(self.seat_coordinates.keys())
+        self.row_sections = numpy.searchsorted(self.section_row_numbers, numpy.arange(self.section_row_numbers[-1] + 1), side = "left") # row number -> index of its section
+
+        # which door every seat boards through
+        row_doors = assign_doors(door_assignment, row_x = self.row_x, row_seats = {row: len(self.section_seats[self.which_section(row_number = row)]) for row in self.row_x}, door_x = [door.x for door in self.doors])
+        self.seat_doors = dict(((seat, row_doors[int(seat[:-1])]) for seat in self.seat_list)) # seat -> index of the door it is boarded through
+
+        # ROUTE TABLE
+        # a passenger's route is the corners of the boarding queue ahead of where they spawned, then the way from their door to their seat
+        # both only depend on the plane, so they are worked out once here, and spawning only has to look them up
+        self.seat_walkways = dict(((seat, self.seat_walkway(seat = seat)) for seat in self.seat_list)) # seat -> index of the walkway it is boarded from
+        self.routes = dict((((seat, walkway_index), self.cabin_route(seat = seat, walkway_index = walkway_index, door_index = self.seat_doors[seat])) for seat in self.seat_list for walkway_index in range(self.n_walkways))) # (seat, walkway_index) -> points from the seat's door
+
+    # figure out which section a row is in
+    def which_section(self, row_number):
+        if row_number >= len(self.row_sections): # past the last row
+            return(None)
+        return(self.sections[self.row_sections[max(row_number, 0)]])
+
+    # ROUTES
+    ##############################################
+
+    # which walkway a seat is boarded from: the closest one
+    def seat_walkway(self, seat):
+        if self.n_walkways == 1:
+            return(0)
+        else: # if n_walkways == 2
+            section_seats = self.section_seats[self.which_section(row_number = int(seat[:-1]))]
+            seat_proportion = (section_seats.index(seat[-1]) + 1) / len(section_seats)
+            return(int(round(seat_proportion)))
+
+    # points from a door (door_index), along walkway walkway_index, to a seat
+    # through the door, passengers head for the walkway of the section they go into (the one behind the door, or the one in front of it),
+    # and every section they cross into, they switch walkways in its first leg room, since walkways don't line up from section to section
+    def cabin_route(self, seat, walkway_index, door_index = 0):
+        row = int(seat[:-1])
+        door_x = self.doors[door_index].x
+        seat_coords = self.seat_coordinates[seat]
+        y_walkway = lambda section_index: self.y_walkways[self.sections[section_index]][walkway_index]
+        x_section = lambda section_index: self.x_walkways[self.sections[section_index]]
+
+        # maneuvre passenger to their row
+        if self.row_x[row] > door_x: # toward the back
+            walkway_section_index = self.row_sections[min(other for other, x in self.row_x.items() if x > door_x)] # section behind the door
+            target_points = [(door_x, y_walkway(walkway_section_index)), ] # plane entryway point
+            while walkway_section_index < self.row_sections[row]:
+                walkway_section_index += 1
+                target_points.append((x_section(walkway_section_index), y_walkway(walkway_section_index - 1))) # go to the correct x point of next section
+                target_points.append((x_section(walkway_section_index), y_walkway(walkway_section_index))) # adjust walkway y coordinate
+        else: # toward the front
+            walkway_section_index = self.row_sections[max(other for other, x in self.row_x.items() if x <= door_x)] # section in front of the door
+            target_points = [(door_x, y_walkway(walkway_section_index)), ] # plane entryway point
+            while walkway_section_index > self.row_sections[row]:
+                target_points.append((x_section(walkway_section_index), y_walkway(walkway_section_index))) # go to the start of this section
+                target_points.append((x_section(walkway_section_index), y_walkway(walkway_section_index - 1))) # adjust walkway y coordinate
+                walkway_section_index -= 1
+        row_x_coord = self.row_x[row]
+        target_points.append((row_x_coord, y_walkway(walkway_section_index)))
+
+        # manuevre passenger to their seat
+        target_points.append((row_x_coord, seat_coords[1]))
+        target_points.append(tuple(seat_coords))
+
+        return(tuple(target_points))
+
+    # determine list of points a passenger needs to travel to to get to their seat
+    # spawnpoint_index is where in the boarding queue of their door the passenger spawned
+    def target_points(self, seat, spawnpoint_index):
+        return(self.doors[self.seat_doors[seat]].queue_routes[spawnpoint_index] + self.routes[(seat, self.seat_walkways[seat])])
+
+    ##############################################
+
+##################################################
+
+
+# DEFINE "passenger" CLASS
+##################################################
+# ex. # Phil = passenger(simulation = sim, zone = 3, seat = "27C")
+
+class passenger:
+
+    # CREATE INSTANCE OF PASSENGER
+    ##############################################
+    def __init__(self, simulation, zone = 0, seat = ""):
+
+        # instance variables
+        self.simulation = simulation
+        self.cabin = simulation.cabin
+        self.zone = int(zone) # needs to be a number, not letter
+        self.seat = seat
+        self.coords = None # coordinates of passenger, once they have spawned
+        self.row = int(seat[:-1]) # get seat row value from the seat
+        self.col = seat[-1] # get seat column value from the seat
+        self.section = self.cabin.which_section(row_number = self.row)
+        self.door = self.cabin.seat_doors[seat] # index of the door they board through
+        self.seat_coords = self.cabin.seat_coordinates[seat] # coordinates of seat
+
+        # instance variables
+        self.spawned = False
+        self.reached_current_target = False # has passenger reached current target
+        self.tpi = 0 # target point index
+        self.in_seat = False # has the passenger reached their final target (their seat)
+        self.asleep = False # is the passenger stuck until one of their blockers moves
+        self.blockers = () # what stopped the passenger from moving, either passengers or the cabin's obstacles
+
+    ##############################################
+
+    # COLLISION FUNCTIONS
+    ##############################################
+
+    # what a passenger centered at center would overlap: the cabin's obstacles (walls, arm/backrests), another passenger, or None
+    def blocker(self, center):
+        # note that as the bounding_box_margin is increased, it becomes harder to fit through things
+        reach = self.cabin.passenger_radius + self.cabin.bounding_box_margin
+
+        # walls and arm/backrests, usually just a lookup in the occupancy mask
+        if self.cabin.obstacles.collides(point = center):
+            return(self.cabin.obstacles) # collision was detected
+
+        # other passengers, only those in the neighbouring cells of the spatial hash
+        return(self.simulation.passenger_index.first(position = center, distance = 2 * reach, exclude = self))
+
+    ##############################################
+
+    # MOTION FUNCTIONS
+    ##############################################
+    # move as many steps of the inputted distance (d = distance) as are free of collisions, up to max_steps; returns what was in the way, if anything
+
+    # for motion along an axis (0 = x, 1 = y)
+    # the stops along the way are the same as taking one step a tick (the last one being whatever is left of d), and
+    # the whole way is swept for other passengers with a single query, so a passenger in free space moves max_steps steps for one lookup
+    def move_along(self, axis, d):
+        cabin = self.cabin
+        step, reach = cabin.step, cabin.passenger_radius + cabin.bounding_box_margin
+
+        # offsets of every stop along the way
+        stops = []
+        while len(stops) < cabin.max_steps:
+            if abs(d) > (len(stops) + 1) * step: # if a large distance is inputted, only travel the maximum amount the passenger can
+                stops.append((d / abs(d)) * (len(stops) + 1) * step)
+            else:
+                stops.append(d)
+                break
+
+        # go as far as the first stop that would collide
+        others, blocker, offset = None, None, None
+        for stop in stops:
+            center = (self.coords[0] + stop, self.coords[1]) if axis == 0 else (self.coords[0], self.coords[1] + stop)
+            if len(stops) == 1: # a single step, nothing to sweep
+                blocker = self.blocker(center = center)
+            elif cabin.obstacles.collides(point = center): # walls and arm/backrests, usually just a lookup in the occupancy mask
+                blocker = cabin.obstacles
+            else:
+                if others is None: # other passengers anywhere along the way, from the neighbouring cells of the spatial hash
+                    half_way = stops[-1] / 2
+                    middle = (self.coords[0] + half_way, self.coords[1]) if axis == 0 else (self.coords[0], self.coords[1] + half_way)
+                    others = [(other, self.simulation.passenger_index.positions[other]) for other in self.simulation.passenger_index.neighbours(position = middle, distance = (2 * reach) + abs(half_way), exclude = self)]
+                blocker = next((other for other, (x_other, y_other) in others if hypot(x_other - center[0], y_other - center[1]) < 2 * reach), None)
+            if blocker is not None:
+                break
+            offset = stop
+
+        if offset is not None:
+            self.coords[axis] += offset # update coordinates
+            self.simulation.moved(passenger = self, dx = offset if axis == 0 else 0, dy = offset if axis == 1 else 0)
+            return(None)
+        return(blocker)
+
+    # for motion in y direction
+    # up = -d, down = +d
+    def move_v(self, d):
+        return(self.move_along(axis = 1, d = d))
+
+    # for motion in x direction
+    # left = -d, right = +d
+    def move_h(self, d):
+        return(self.move_along(axis = 0, d = d))
+
+    ##############################################
+
+    # SPAWNING
+    ##############################################
+
+    def spawn(self):
+        spawnpoint_index = self.simulation.free_spawnpoint(door_index = self.door)
+        if spawnpoint_index is None: # if final spawning location is occupied
+            return(None) # wait until next iteration to try to spawn
+
+        # determine spawning location
+        self.coords = list(self.cabin.doors[self.door].spawning_locs[spawnpoint_index])
+
+        # update self.spawned to indicate that the passenger has spawned
+        self.spawned = True
+        self.simulation.spawned(passenger = self)
+
+        # determine how passenger will proceed
+        self.target_points = self.determine_target_points(spawnpoint_index = spawnpoint_index)
+
+    ##############################################
+
+    # NAVIGATION METHODS
+    ##############################################
+
+    # determine list of points the passenger needs to travel to to get to seat, from where they spawned in the boarding queue
+    def determine_target_points(self, spawnpoint_index):
+        return(self.cabin.target_points(seat = self.seat, spawnpoint_index = spawnpoint_index))
+
+    # figure out which way to move
+    # if neither way is possible, nothing will change until something in the way moves, so the passenger sleeps until then
+    def move_to_target(self, target):
+
+        distance = [target[0] - self.coords[0], target[1] - self.coords[1]]
+
+        if abs(distance[1]) >= abs(distance[0]): # if the y distance is farther than x distance
+            y_o = self.coords[1] # initial y value
+            blocker = self.move_v(d = distance[1])
+            if y_o == self.coords[1]: # if the passenger didn't move in the y-direction because collision detected
+                other_blocker = self.move_h(d = distance[0]) # then move in the x-direction
+                if blocker is not None and (other_blocker is not None or distance[0] == 0):
+                    self.simulation.sleep(passenger = self, blockers = (blocker, other_blocker))
+            del y_o
+
+        elif abs(distance[1]) < abs(distance[0]): # if the x distance is farther than y distance
+            x_o = self.coords[0] # initial x value
+            blocker = self.move_h(d = distance[0])
+            if x_o == self.coords[0]: # if the passenger didn't move in the x-direction because collision detected
+                other_blocker = self.move_v(d = distance[1]) # then move in the y-direction
+                if blocker is not None and (other_blocker is not None or distance[1] == 0):
+                    self.simulation.sleep(passenger = self, blockers = (blocker, other_blocker))
+            del x_o
+
+        # update x and y distances
+        distance = [target[0] - self.coords[0], target[1] - self.coords[1]]
+
+        if abs(distance[0]) == 0 and abs(distance[1]) == 0:
+            self.reached_current_target = True # if the passenger has reached target, update variable
+        else:
+            self.reached_current_target = False
+
+        del distance
+
+    ##############################################
+
+    # MAIN METHOD
+    ##############################################
+
+    # the passenger will do some action
+    def move(self):
+
+        # spawning mechanics
+        if not self.spawned:
+            self.spawn()
+            return(None)
+
+        # if the passenger has reached their seat, or is stuck until something in the way moves, remain static
+        if self.in_seat or self.asleep:
+            return(None)
+
+        # if the passenger is still working towards their seat
+        else:
+            # if reached current target
+            if self.reached_current_target:
+                if self.tpi < len(self.target_points) - 1: # if the passenger is yet to reach his/her seat
+                    self.tpi += 1 # update target point index
+                    self.reached_current_target = False # reset whether passenger has reached current target
+                    self.move_to_target(target = self.target_points[self.tpi]) # begin moving right away
+                else: # once the passenger has reached their final target, their seat
+                    self.in_seat = True
+                return(None)
+
+            # if passenger is yet to reach current target
+            else:
+                self.move_to_target(target = self.target_points[self.tpi])
+                return(None)
+
+    ##############################################
+
+##################################################
+
+
+# SIMULATION
+##################################################
+# one boarding of one plane
+# observer (optional) is told about every spawn and move, e.g. to draw them, and when a tick or zone is over, e.g. to decide when to redraw;
+# it needs .spawned(passenger), .moved(passenger, dx, dy), .ticked(simulation) and .boarded(simulation)
+# boarding raises watchdog.stalled once it is deadlocked, nobody has got anywhere for stall_ticks ticks, or it is over max_ticks ticks or max_seconds (wall-clock) seconds
+
+class simulation:
+
+    def __init__(self, cabin, observer = None, stall_ticks = 1000, max_ticks = None, max_seconds = None):
+        self.cabin = cabin
+        self.observer = observer
+        self.watchdog = watchdog(stall_ticks = stall_ticks, max_ticks = max_ticks, max_seconds = max_seconds)
+        self.progressed = False # has anyone moved, spawned or sat down this tick
+        self.passengers = [] # every passenger that has spawned (and so can be collided with)
+        self.passenger_index = spatial_hash(cell_size = 2 * cabin.passenger_radius) # where every spawned passenger is, cells are one passenger diameter wide
+        self.queues = [queue_slots(slots = door.spawning_locs, distance = 2 * (cabin.passenger_radius + cabin.bounding_box_margin), blocked = door.blocked) for door in cabin.doors] # who is in which spawning location of every door
+        self.spawnpoint_indices = [0, ] * len(cabin.doors) # where in every door's boarding queue the next passenger spawns
+        self.zone = 0 # last zone called to the boarding queue
+        self.ticks = 0 # number of times every passenger called to board has had the chance to move
+        self.moving = [] # passengers called to board that have spawned but aren't in their seat yet, in boarding order
+        self.pending = [deque() for _ in cabin.doors] # passengers called to board yet to spawn at every door, in boarding order
+        self.sleepers = {} # passenger -> passengers asleep until they move
+
+    # create the passengers of a zone
+    def create_passengers(self, zone, seats):
+        return(list(map(lambda seat: passenger(simulation = self, zone = zone, seat = seat), seats)))
+
+    # a passenger has spawned
+    def spawned(self, passenger):
+        self.progressed = True
+        self.passengers.append(passenger)
+        self.passenger_index.insert(item = passenger, position = passenger.coords)
+        self.queues[passenger.door].update(item = passenger, position = passenger.coords)
+        if self.observer is not None:
+            self.observer.spawned(passenger = passenger)
+
+    # a passenger has moved
+    def moved(self, passenger, dx, dy):
+        self.passenger_index.move(item = passenger, position = passenger.coords)
+        if dx != 0 or dy != 0:
+            self.progressed = True
+            self.queues[passenger.door].update(item = passenger, position = passenger.coords)
+            if passenger in self.sleepers:
+                self.wake(blocker = passenger)
+        if self.observer is not None:
+            self.observer.moved(passenger = passenger, dx = dx, dy = dy)
+
+    # passenger can't move until one of blockers does (the cabin's obstacles never do)
+    def sleep(self, passenger, blockers):
+        passenger.asleep, passenger.blockers = True, blockers
+        for blocker in blockers:
+            if isinstance(blocker, type(passenger)):
+                self.sleepers.setdefault(blocker, set()).add(passenger)
+
+    # blocker has moved, so whoever it was in the way of can try again (this tick, if they come after blocker in boarding order)
+    def wake(self, blocker):
+        for sleeper in self.sleepers.pop(blocker):
+            sleeper.asleep = False
+            for other in sleeper.blockers:
+                if other is not blocker and other in self.sleepers:
+                    self.sleepers[other].discard(sleeper)
+            sleeper.blockers = ()
+
+    # where the next passenger at a door can spawn: the first free spawning location of its boarding queue from its spawnpoint index on, or None if the last one is taken
+    # passengers line up behind whoever spawned before them (the spawnpoint index only goes back when more passengers are called), so this is constant time per spawn
+    def free_spawnpoint(self, door_index = 0):
+        queue, last = self.queues[door_index], len(self.cabin.doors[door_index].spawning_locs) - 1
+        while self.spawnpoint_indices[door_index] < last and queue.occupied(i = self.spawnpoint_indices[door_index]):
+            self.spawnpoint_indices[door_index] += 1
+        return(None if queue.occupied(i = self.spawnpoint_indices[door_index]) else self.spawnpoint_indices[door_index])
+
+    # how many passengers called to board are yet to spawn
+    def waiting(self):
+        return(sum(map(len, self.pending)))
+
+    # one tick: every passenger called to board has the chance to move once
+    # seated passengers never move again, so only those still moving are visited; spawned passengers always come before
+    # those yet to spawn in boarding order, and once one can't spawn, nobody after them at the same door can this tick either
+    # if nobody got anywhere and everyone is asleep, nobody ever will: boarding is deadlocked
+    # a tick with everyone called already seated is a tick of waiting for the release policy to call more passengers, not of being stuck
+    def tick(self):
+        self.progressed = len(self.moving) == 0 and self.waiting() == 0
+        for passenger in self.moving:
+            passenger.move()
+        if any(passenger.in_seat for passenger in self.moving):
+            self.progressed = True
+            self.moving = [passenger for passenger in self.moving if not passenger.in_seat]
+        for pending in self.pending: # every door's boarding queue
+            while len(pending) > 0:
+                pending[0].move()
+                if not pending[0].spawned:
+                    break
+                self.moving.append(pending.popleft())
+        self.ticks += 1
+        if self.observer is not None:
+            self.observer.ticked(simulation = self)
+        deadlocked = not self.progressed and len(self.moving) > 0 and all(passenger.asleep for passenger in self.moving)
+        self.watchdog.check(ticks = self.ticks, progressed = self.progressed, deadlocked = deadlocked, describe = self.describe)
+
+    # where boarding is stuck, for the watchdog's report
+    def describe(self):
+        blocked_by = lambda stuck: ["wall" if blocker is self.cabin.obstacles else blocker.seat for blocker in stuck.blockers if blocker is not None]
+        return({
+            "zone"      : min(passenger.zone for passenger in self.moving + [waiting for pending in self.pending for waiting in pending]) if len(self.moving) + self.waiting() > 0 else None,
+            "seated"    : len(self.passengers) - len(self.moving),
+            "waiting"   : self.waiting(),
+            "stuck"     : [{"seat": stuck.seat, "coords": tuple(stuck.coords), "target": tuple(stuck.target_points[stuck.tpi]), "blocked_by": blocked_by(stuck)} for stuck in self.moving],
+            "blocked_by": {stuck.seat: [seat for seat in blocked_by(stuck) if seat != "wall"] for stuck in self.moving}
+            })
+
+    # board zones of passengers, zones = [[passenger, ...], [passenger, ...], ...], one tick at a time, yielding after every tick, so the caller decides when the next tick happens
+    # release (see release.py) decides when passengers are called to the boarding queue, by default each zone once everyone called before them is seated;
+    # passengers who are called line up at the back of the boarding queue, behind whoever is still in it
+    def boarding_passengers(self, zones, release = None):
+        release = release if release is not None else barrier()
+        passengers = [passenger for zone in zones for passenger in zone]
+        zone_ends = list(accumulate(map(len, zones))) if len(zones) > 0 else [0, ]
+        released, start = 0, self.ticks
+        self.moving, self.pending = [], [deque() for _ in self.cabin.doors]
+        while True:
+            seated = released - len(self.moving) - self.waiting()
+            calling = release.release(ticks = self.ticks - start, released = released, seated = seated, zone_ends = zone_ends)
+            if calling > released:
+                for passenger in passengers[released:calling]:
+                    if len(self.pending[passenger.door]) == 0: # the line at this door has all spawned
+                        self.spawnpoint_indices[passenger.door] = self.queues[passenger.door].behind()
+                    self.pending[passenger.door].append(passenger)
+                self.zone = passengers[calling - 1].zone
+                released = calling
+            if len(self.moving) == 0 and self.waiting() == 0: # everyone called is seated
+                if released > 0 and self.observer is not None:
+                    self.observer.boarded(simulation = self)
+                if released == len(passengers):
+                    break
+            self.tick()
+            yield self.ticks
+
+    # board a zone of passengers one tick at a time, yielding after every tick
+    def boarding_zone(self, passengers):
+        yield from self.boarding_passengers(zones = [passengers, ])
+
+    # board zone after zone, zones = [[seat, seat, ...], [seat, ...], ...], one tick at a time, yielding after every tick
+    def boarding(self, zones, release = None):
+        yield from self.boarding_passengers(zones = [self.create_passengers(zone = i, seats = seats) for i, seats in enumerate(zones, start = 1)], release = release)
+
+    # board a zone of passengers, returns once all of them are in their seats
+    def board(self, passengers):
+        for _ in self.boarding_zone(passengers = passengers):
+            pass
+        return(self.ticks)
+
+    # board zone after zone, zones = [[seat, seat, ...], [seat, ...], ...]; returns total number of ticks
+    def run(self, zones, release = None):
+        for _ in self.boarding(zones = zones, release = release):
+            pass
+        return(self.ticks)
+
+##################################################
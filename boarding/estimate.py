@@ -0,0 +1,97 @@
+# ESTIMATE
+# Predict boarding time from the boarding order alone, without moving anyone.
+
+# In a single walkway, a passenger is held up by everyone ahead of them in line whose row is on the way to
+# their own (closer to their door, or the same row), while that passenger sits down. So boarding time grows with the
+# longest blocking chain: the longest run of passengers, in boarding order, whose rows get further and further from
+# the door (a longest non-decreasing subsequence, found in O(n log n)). Passengers using different walkways or doors, or going
+# different ways from their door, never block each other. Besides that, everyone has to get through their door one at a
+# time, and the passenger seated furthest away has to walk there. The estimate of every zone is
+#     intercept + (door * passengers through the busiest door) + (chain * longest blocking chain) + (walk * ticks to walk to the furthest row)
+# The default coefficients come from the plane's geometry; fit() tunes them to boarding times from a simulation.
+
+
+# IMPORTS
+##################################################
+
+from bisect import bisect_right # for blocking chains
+from collections import Counter # for passengers through every door
+import numpy # for fitting coefficients
+
+##################################################
+
+
+# BLOCKING CHAINS
+##################################################
+
+# length of the longest non-decreasing subsequence of keys, in O(n log n) (patience sorting)
+def blocking_chain(keys):
+    tails = [] # tails[i] is the smallest key that ends a chain of length i + 1
+    for key in keys:
+        i = bisect_right(tails, key)
+        if i == len(tails):
+            tails.append(key)
+        else:
+            tails[i] = key
+    return(len(tails))
+
+##################################################
+
+
+# ESTIMATOR
+##################################################
+# ex. # ticks = estimator(cabin = cabin).estimate(zones = [seat_list[:20], seat_list[20:40], ...])
+
+class estimator:
+
+    def __init__(self, cabin, coefficients = None):
+        self.cabin = cabin
+        stride, diameter = cabin.stride, 2 * cabin.passenger_radius
+
+        # for every seat: (door, walkway, side of the door) it is reached by, how far from its door its row is, and how long walking there takes
+        self.groups, self.distances, self.walk_ticks = {}, {}, {}
+        for seat in cabin.seat_list:
+            x, door_x = cabin.row_x[int(seat[:-1])], cabin.doors[cabin.seat_doors[seat]].x
+            self.groups[seat] = (cabin.seat_doors[seat], cabin.seat_walkways[seat], x >= door_x)
+            self.distances[seat] = abs(x - door_x)
+            route = numpy.array(cabin.target_points(seat = seat, spawnpoint_index = 0))
+            self.walk_ticks[seat] = float(numpy.sum(numpy.abs(numpy.diff(route, axis = 0)))) / stride # passengers move along one axis at a time
+
+        # intercept, door, chain, walk
+        self.coefficients = numpy.array(coefficients if coefficients is not None else (0.0, diameter / stride, 2 * diameter / stride, 1.0), dtype = "float64")
+
+    # [number of zones, passengers through the busiest door, longest blocking chains, ticks to walk to the furthest seats], summed over every zone
+    def features(self, zones):
+        features = numpy.zeros(shape = 4, dtype = "float64")
+        for seats in zones:
+            if len(seats) == 0:
+                continue
+            chains = {}
+            for seat in seats:
+                chains.setdefault(self.groups[seat], []).append(self.distances[seat])
+            features += (1, max(Counter((self.cabin.seat_doors[seat] for seat in seats)).values()), max(map(blocking_chain, chains.values())), max(self.walk_ticks[seat] for seat in seats))
+        return(features)
+
+    # predicted number of ticks boarding takes
+    def estimate(self, zones):
+        return(float(self.features(zones = zones) @ self.coefficients))
+
+    # tune the coefficients (least squares) to boardings = [zones, zones, ...] that took times = [ticks, ticks, ...] in a simulation
+    def fit(self, boardings, times):
+        features = numpy.array([self.features(zones = zones) for zones in boardings])
+        self.coefficients = numpy.linalg.lstsq(features, numpy.array(times, dtype = "float64"), rcond = None)[0]
+        return(self.coefficients)
+
+    # how far to trust the estimates: mean absolute percentage error, and how well boardings are ranked (Spearman correlation)
+    def compare(self, boardings, times):
+        estimates = numpy.array([self.estimate(zones = zones) for zones in boardings])
+        times = numpy.array(times, dtype = "float64")
+        ranks = lambda values: numpy.argsort(numpy.argsort(values))
+        return({
+            "mean_absolute_percentage_error": float(numpy.mean(numpy.abs(estimates - times) / times)),
+            "rank_correlation"              : float(numpy.corrcoef(ranks(estimates), ranks(times))[0, 1]) if len(times) > 1 else numpy.nan,
+            "estimates"                     : estimates,
+            "times"                         : times
+            })
+
+##################################################
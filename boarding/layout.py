@@ -0,0 +1,244 @@
+# LAYOUT
+# Compile a seat layout table into the geometry of the plane.
+
+# A layout is a list of sections, front to back, each a record (section, seat_layout, n_rows, leg_room, seat_depth),
+# like the rows of seat_layouts in airplane_boarding.py once it has been cleaned up. Compiling a layout works out where
+# every row line and column line of the plane goes, where every seat is, and where the walkways are, with cumulative
+# sums over whole arrays instead of filling tables one cell at a time. Everything is in passenger diameters (a passenger
+# is 1 wide), never in pixels, so the size of the window doesn't change the plane; the window scales it to pixels just
+# to draw it. The result is a geometry, which only holds plain Python/NumPy structures, so it can be pickled: compiled
+# geometries are cached on disk, keyed by a hash of the layout, the number of exits and the dimensions it was compiled
+# with, so parameter sweeps only pay for a layout once, and a layout compiles to the same plane on every machine.
+
+
+# IMPORTS
+##################################################
+
+import os # for the cache
+import pickle # for the cache
+from hashlib import sha256 # for cache keys
+from collections import namedtuple # for geometry
+import numpy # for vectorized construction
+
+##################################################
+
+
+# CONSTANTS
+##################################################
+
+# bump whenever build() changes, so old cached geometries are not reused
+geometry_version = 3
+
+# where compiled geometries are kept
+cache_directory = os.path.join(os.path.expanduser("~"), ".cache", "airplane_boarding", "layouts")
+
+# get midpoint of two points
+midpoint = lambda a, b: (a + b) / 2
+
+##################################################
+
+
+# GEOMETRY
+##################################################
+# row_lines = {"line": x-values, "type": what is TO THE LEFT (after) of each line, "section": ..., "row_number": ...}
+#    types are "seat", "floor", "exit" (special type of floor), "aisle" (cross aisle between sections, special type of floor), "os" [OFFSET] (special type of floor), or "" (nothing)
+# col_lines = {section: {"line": y-values, "type": what is BELOW each line}}
+# seat_coordinates = {seat: (x, y)}, x_walkways = {section: x}, y_walkways = {section: [y, ...]} (A-F starts at the bottom side), row_x = {row_number: x}
+
+geometry = namedtuple("geometry", (
+    "key",
+    "sections", "section_layouts", "section_row_numbers", "n_walkways", "has_first_class",
+    "gateway_width", "passenger_diameter", "passenger_radius", "plane_length", "plane_width",
+    "canvas_width", "canvas_height", "x0", "x1", "x0_os", "x2_os", "y0", "y1", "y0_inner", "y1_inner",
+    "row_lines", "col_lines",
+    "seat_list", "seat_coordinates", "x_walkways", "y_walkways", "row_x"
+    ))
+
+##################################################
+
+
+# BUILD
+##################################################
+# dimensions = {"wall_width", "gateway_size", "gate_offset", "wfve", "wfve_tail", "wfhe", "passenger_outline_width", "seat_coordinate_method"}
+# lengths in passenger diameters (see plane.py for what each of these are)
+
+def build(layout, n_exits, dimensions, key = None):
+    wall_width, gateway_size, gate_offset = dimensions["wall_width"], dimensions["gateway_size"], dimensions["gate_offset"]
+    wfve, wfve_tail, wfhe = dimensions["wfve"], dimensions["wfve_tail"], dimensions["wfhe"]
+
+    names = [record[0] for record in layout]
+    seat_layouts = dict(((record[0], record[1]) for record in layout))
+    n_rows = numpy.array([record[2] for record in layout], dtype = "int64")
+    leg_rooms = numpy.array([record[3] for record in layout], dtype = "float64")
+    seat_depths = numpy.array([record[4] for record in layout], dtype = "float64")
+    sections = tuple(name for name, n in zip(names, n_rows) if n != 0)
+    n_first = int(n_rows[names.index("first")]) if "first" in names else 0
+    has_first_class = (n_first != 0)
+    n_walkways = len(seat_layouts[sections[0]].split()) - 1
+
+    # FIGURE OUT THE ROWS
+    # first just use ratios to figure out where everything goes, then scale to the plane's length
+    n_row = int(numpy.sum(n_rows))
+    line = numpy.column_stack((numpy.repeat(leg_rooms, n_rows), numpy.repeat(seat_depths, n_rows))).reshape(-1) # leg room, then a seat, for every row
+    kind = numpy.tile(numpy.array(["floor", "seat"], dtype = "object"), n_row)
+    section = numpy.repeat(numpy.array(names, dtype = "object"), 2 * n_rows)
+    row_number = numpy.repeat(numpy.arange(1, n_row + 1, dtype = "int64"), 2)
+    row_lines = [line, kind, section, row_number]
+    insert = lambda row_lines, i, values: [numpy.insert(column, i, value) for column, value in zip(row_lines, values)]
+
+    # CROSS AISLES
+    # walkways don't line up between sections with different seat layouts, so passengers switch walkways in a cross aisle
+    # one gateway wide between them (like a galley), instead of in the leg room of the first row behind it, where that row's passengers turn into their seats
+    section_starts = dict(zip(names, (2 * numpy.concatenate(([0], numpy.cumsum(n_rows)[:-1]))).tolist())) # first line of every section
+    for previous, name in reversed(list(zip(sections[:-1], sections[1:]))):
+        if seat_layouts[previous] != seat_layouts[name]:
+            row_lines = insert(row_lines, section_starts[name], (gateway_size, "aisle", "aisle", 0))
+    line = row_lines[0]
+
+    # turn into fractions, as if every exit was already there (sum in the same order as the lines, front to back)
+    total = sum(([gate_offset, ] if not has_first_class else []) + line.tolist() + ([gateway_size, ] * n_exits))
+    row_lines[0] = row_lines[0] / total
+    gateway_fraction = gateway_size / total # fraction that each exit takes up
+
+    # the plane is as long as its rows and exits, and leaves wfve of the canvas in front of it and wfve_tail behind it
+    plane_length = total + (wall_width / 2)
+    canvas_width = plane_length / (1 - wfve - wfve_tail)
+    x0 = wfve * canvas_width
+    x1 = x0 + plane_length
+
+    # FIGURE OUT EXITS
+    # regardless of number of exits, there will always be one where the plane connects with the gate
+    if has_first_class:
+        row_lines = insert(row_lines, 0, (0.0, "", "", 0)) # front line of chasse; "" because there's cockpit to the left (nothing)
+        gate_index = (n_first * 2) + 1 # + 1 because of the front of chasse line
+    else: # no first class, add the small gate offset at the front
+        row_lines = insert(row_lines, 0, (gate_offset / total, "os", "", -1))
+        gate_index = 1 # accounting for the extra row for the gate offset
+    row_lines = insert(row_lines, gate_index, (gateway_fraction, "exit", "exit", 0))
+
+    # in addition to the exit at the front, there will be one in the back
+    if n_exits >= 2:
+        row_lines = insert(row_lines, len(row_lines[0]), (gateway_fraction, "exit", "exit", 0))
+
+        # in addition to the two exits mentioned previously, one exit on the wing (a little before halfway)
+        if n_exits >= 3:
+            k = max(int(numpy.count_nonzero(numpy.cumsum(row_lines[0]) < 0.5)) - 1, 0) # the line right before the cumulative sum crosses half
+            if row_lines[1][k] == "seat": # we want the exit to insert in front a floor, not a seat
+                k -= 1
+            row_lines = insert(row_lines, k, (gateway_fraction, "exit", "exit", 0))
+
+    # convert to passenger diameters, so that the outlines won't overlap the plane walls
+    line, kind, section, row_number = row_lines
+    line = (numpy.cumsum(line) * total) + x0 + (wall_width / 2)
+    # shift so that "type" and "section" show the value TO THE LEFT (after) of the line
+    kind, section, row_number = numpy.append(kind[1:], ""), numpy.append(section[1:], ""), numpy.append(row_number[1:], -1)
+
+    # determine passenger dimensions
+    gate_index = int(numpy.flatnonzero(kind == "exit")[0])
+    x0_os, x2_os = float(line[gate_index]), float(line[gate_index + 1]) # x-values for where the gate intersect the body of the plane
+    gateway_width = x2_os - x0_os # size of stairs and walkway and main aisles
+    passenger_diameter = 1.0 # the unit everything is measured in
+    passenger_radius = passenger_diameter / 2
+
+    # DETERMINE PLANE WIDTH BY USING ECONOMY SEATS
+    last_section_with_rows = sections[-1]
+    n_seats_per_row = dict(((name, len("".join(seat_layouts[name].split()))) for name in sections))
+    plane_width = ((n_walkways * gateway_size) + (n_seats_per_row[last_section_with_rows] * seat_depths[names.index(last_section_with_rows)])) * passenger_diameter
+    canvas_height = plane_width / (1 - (2 * wfhe))
+    y0, y1 = wfhe * canvas_height, (1 - wfhe) * canvas_height
+    y0_inner, y1_inner = y0 + wall_width, y1 - wall_width
+
+    # FIGURE OUT THE COLUMNS
+    col_lines = {}
+    for name in sections:
+        is_walkway = numpy.array(list(seat_layouts[name][::-1])) == " " # because seat layouts are meant to be laid out left-to-right
+        seat_width = ((y1_inner - y0_inner) - (n_walkways * gateway_width)) / n_seats_per_row[name]
+        col_lines[name] = {
+            "line": numpy.cumsum(numpy.concatenate(([y0_inner], numpy.where(is_walkway, gateway_width, seat_width)))),
+            "type": numpy.append(numpy.where(is_walkway, "floor", "seat").astype("object"), "") # what type of line is BELOW the line
+            }
+
+    # FIGURE OUT COORDINATES OF SEATS
+    # methods:
+    #    1 = midpoint
+    #    2 = some distance from the back of the seat
+    seat_list, seat_coordinates, x_walkways, y_walkways = [], {}, {}, {}
+    for name in sections:
+        in_section = numpy.flatnonzero(section == name) # leg room and seat lines of every row, in pairs
+        if dimensions["seat_coordinate_method"] == 1:
+            row_midpoints = midpoint(line[in_section[0::2] + 1], line[in_section[1::2] + 1])
+        else:
+            row_midpoints = line[in_section[1::2] + 1] - (passenger_radius + dimensions["passenger_outline_width"])
+        row_midpoints = row_midpoints - wall_width
+        lines, types = col_lines[name]["line"], col_lines[name]["type"]
+        col_midpoints = midpoint(lines[:-1], lines[1:])[types[:-1] == "seat"][::-1] # A-F starts at the bottom side
+        rows = row_number[in_section[0::2]]
+        for row, x in zip(rows.tolist(), row_midpoints.tolist()):
+            for letter, y in zip("".join(seat_layouts[name].split()), col_midpoints.tolist()):
+                seat_list.append(f"{row}{letter}")
+                seat_coordinates[seat_list[-1]] = (x, y)
+
+        # KEY TARGET POINTS, where passengers switch to the walkways of each section: the cross aisle in front of it, or else its first leg room
+        if in_section[0] > 0 and section[in_section[0] - 1] == "aisle":
+            x_walkways[name] = float(midpoint(line[in_section[0] - 1], line[in_section[0]]))
+        else:
+            x_walkways[name] = float(midpoint(line[in_section[0]], line[in_section[1]]))
+        y_walkways[name] = [float(midpoint(lines[i], lines[i + 1])) for i in numpy.flatnonzero(types == "floor")[::-1]]
+
+    # where each row starts
+    in_rows = numpy.flatnonzero(row_number > 0)
+    row_x = dict(zip(row_number[in_rows[0::2]].tolist(), midpoint(line[in_rows[0::2]], line[in_rows[1::2]]).tolist()))
+
+    # nothing of this is going to change
+    for array in (line, kind, section, row_number, *(array for lines in col_lines.values() for array in lines.values())):
+        array.flags.writeable = False
+
+    return(geometry(
+        key = key,
+        sections = sections, section_layouts = seat_layouts, section_row_numbers = tuple(numpy.cumsum(n_rows[n_rows != 0]).tolist()),
+        n_walkways = n_walkways, has_first_class = has_first_class,
+        gateway_width = gateway_width, passenger_diameter = passenger_diameter, passenger_radius = passenger_radius, plane_length = float(plane_length), plane_width = float(plane_width),
+        canvas_width = float(canvas_width), canvas_height = float(canvas_height), x0 = float(x0), x1 = float(x1), x0_os = x0_os, x2_os = x2_os, y0 = float(y0), y1 = float(y1), y0_inner = float(y0_inner), y1_inner = float(y1_inner),
+        row_lines = {"line": line, "type": kind, "section": section, "row_number": row_number}, col_lines = col_lines,
+        seat_list = tuple(seat_list), seat_coordinates = seat_coordinates, x_walkways = x_walkways, y_walkways = y_walkways, row_x = row_x
+        ))
+
+##################################################
+
+
+# COMPILE
+##################################################
+# build, or load from the cache if this exact layout was compiled before; cache_directory = None turns the cache off
+# ex. # geometry = compile_layout(layout = [("economy", "ABC DEF", 20, 1.6, 1.6)], n_exits = 1, dimensions = dimensions)
+
+# hash of everything the geometry depends on
+def layout_key(layout, n_exits, dimensions):
+    layout = tuple((str(section), str(seat_layout), int(n_rows), float(leg_room), float(seat_depth)) for section, seat_layout, n_rows, leg_room, seat_depth in layout)
+    dimensions = tuple(sorted(((str(name), float(value)) for name, value in dimensions.items())))
+    return(sha256(repr((geometry_version, layout, int(n_exits), dimensions)).encode("utf-8")).hexdigest())
+
+def compile_layout(layout, n_exits, dimensions, cache_directory = cache_directory):
+    key = layout_key(layout = layout, n_exits = n_exits, dimensions = dimensions)
+    path = os.path.join(cache_directory, f"{key}.pickle") if cache_directory is not None else None
+
+    # cached
+    if path is not None and os.path.exists(path):
+        try:
+            with open(path, "rb") as file:
+                return(pickle.load(file))
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError): # a broken cache file is just rebuilt
+            pass
+
+    # not cached
+    compiled = build(layout = layout, n_exits = n_exits, dimensions = dimensions, key = key)
+    if path is not None:
+        try: # write to a temporary file first, so that parallel runs never read half a file
+            os.makedirs(cache_directory, exist_ok = True)
+            with open(f"{path}.{os.getpid()}", "wb") as file:
+                pickle.dump(compiled, file)
+            os.replace(f"{path}.{os.getpid()}", path)
+        except OSError: # no cache, no problem
+            pass
+    return(compiled)
+
+##################################################
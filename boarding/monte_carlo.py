@@ -0,0 +1,256 @@
+# MONTE CARLO
+# Repeat a boarding scenario many times on a pool of processes.
+
+# Each run gets its own seed, and with it its own passengers (see population.py): they either line up within each of the
+# given zones in the order they show up at the gate, or a boarding strategy (see strategies.py) makes a boarding plan
+# with the run's generator. Runs with the same seed see the same passengers, whatever the zones or strategy, so boarding
+# methods are best compared pairwise, seed by seed (see paired). Every run then boards the
+# plane headlessly, and records how many ticks boarding took. The runs are spread across a
+# multiprocessing pool, and the boarding times are summarized as a distribution. A run that gets stuck, or goes
+# over its budget of ticks or seconds, is stopped by the engine's watchdog and reported instead of holding up its worker.
+# Given a store (see results.py), runs boarded before by any sweep are looked up rather than boarded again.
+
+
+# IMPORTS
+##################################################
+
+import multiprocessing # for the process pool
+from statistics import NormalDist # for confidence intervals
+import numpy # for summarizing boarding times
+from boarding import engine
+from boarding import vectorized
+from boarding import discrete
+from boarding.watchdog import stalled # for boardings that were stopped
+from boarding.strategies import boarding_plan # for boarding strategies
+from boarding.strategies import zones_from_plan
+from boarding.release import release_policy # for calling zones before the last one is seated
+from boarding.population import population, generator # for the passengers of every run
+
+##################################################
+
+
+# WORKERS
+##################################################
+# every worker gets its own copy of the plane once, when the pool starts, instead of with every run
+
+worker_cabin = None
+
+def initialize_worker(cabin):
+    global worker_cabin
+    worker_cabin = cabin
+
+# board the plane once, returns the number of ticks boarding took
+# either zones (passengers line up within each zone in the order they show up) or the name of a strategy (with its parameters) is needed
+# max_ticks and max_seconds are the run's budget (the discrete-event engine always finishes, so it doesn't need one)
+# release is the name of a release policy (with its values, see release.py), which only engine.py supports; None boards zone after zone
+# traits are the passengers' luggage_ticks and pace_spread (see population.py), which only discrete.py supports
+def board_once(cabin, zones, seed, vectorized_ticks = False, strategy = None, parameters = {}, discrete_events = False, max_ticks = None, max_seconds = None, release = None, release_values = (), traits = {}):
+    if release is not None and (discrete_events or vectorized_ticks):
+        raise Exception("release exception: Only the agent engine (engine.py) can call a zone before the one before it is seated.")
+    if any(value != 0 for value in traits.values()) and not discrete_events:
+        raise Exception("population exception: Only the discrete-event engine (discrete.py) has passengers stow luggage or walk at their own pace.")
+    passengers = population(seat_list = cabin.seat_list, seed = seed, **traits)
+    if strategy is not None:
+        zones = zones_from_plan(plan = boarding_plan(strategy, cabin = cabin, generator = generator(seed = seed, stream = "arrival"), **parameters))
+    else:
+        zones = passengers.line_up(zones = zones)
+    if discrete_events:
+        return(discrete.simulation(cabin = cabin, population = passengers).run(zones = zones))
+    elif vectorized_ticks:
+        return(vectorized.simulation(cabin = cabin, max_ticks = max_ticks, max_seconds = max_seconds).run(zones = zones))
+    else:
+        return(engine.simulation(cabin = cabin, max_ticks = max_ticks, max_seconds = max_seconds).run(zones = zones, release = release_policy(release, *release_values) if release is not None else None))
+
+# what a worker runs, arguments = (zones, seed, vectorized_ticks, strategy, parameters, discrete_events, max_ticks, max_seconds, release, release_values, traits)
+# returns (ticks, None), or (nan, the watchdog's report) if boarding was stopped
+def run_in_worker(arguments):
+    zones, seed, vectorized_ticks, strategy, parameters, discrete_events, max_ticks, max_seconds, release, release_values, traits = arguments
+    try:
+        return((board_once(cabin = worker_cabin, zones = zones, seed = seed, vectorized_ticks = vectorized_ticks, strategy = strategy, parameters = parameters, discrete_events = discrete_events, max_ticks = max_ticks, max_seconds = max_seconds, release = release, release_values = release_values, traits = traits), None))
+    except stalled as stall:
+        return((numpy.nan, dict(stall.report, seed = seed)))
+
+# the worker task of one run of a scenario (see run_in_worker)
+def task(zones, seed, strategy = None, parameters = {}, vectorized_ticks = False, discrete_events = False, max_ticks = None, max_seconds = None, release = None, release_values = (), traits = {}):
+    return((zones, seed, vectorized_ticks, strategy, dict(parameters), discrete_events, max_ticks, max_seconds, release, tuple(release_values), dict(traits)))
+
+# the outcome of every task (see run_in_worker), looked up in store (see results.py) if it was boarded before, and otherwise boarded with boarder
+# (map, or the map of a pool) and stored; with store = None, every task is boarded
+def board_tasks(cabin, tasks, boarder = map, store = None):
+    if store is None:
+        return(list(boarder(run_in_worker, tasks)))
+    outcomes = store.lookup(cabin = cabin, tasks = tasks)
+    missing = [i for i, outcome in enumerate(outcomes) if outcome is None]
+    boarded = list(boarder(run_in_worker, [tasks[i] for i in missing])) if len(missing) > 0 else []
+    store.save(cabin = cabin, tasks = [tasks[i] for i in missing], outcomes = boarded)
+    for i, outcome in zip(missing, boarded):
+        outcomes[i] = outcome
+    return(outcomes)
+
+##################################################
+
+
+# SUMMARIES
+##################################################
+
+# summarize a distribution of boarding times
+# the confidence interval is for the mean boarding time, using the normal approximation
+def summarize(times, confidence = 0.95, percentiles = (5, 25, 50, 75, 95)):
+    times = numpy.array(times, dtype = "float64")
+    n = len(times)
+    mean = float(numpy.mean(times)) if n > 0 else numpy.nan
+    std = float(numpy.std(times, ddof = 1)) if n > 1 else numpy.nan
+    half_width = NormalDist().inv_cdf(0.5 + (confidence / 2)) * std / numpy.sqrt(n) if n > 1 else numpy.nan
+    return({
+        "n_runs"     : n,
+        "mean"       : mean,
+        "std"        : std,
+        "confidence" : confidence,
+        "ci"         : (mean - half_width, mean + half_width),
+        "percentiles": dict(zip(percentiles, (float(value) for value in numpy.percentile(times, percentiles)))) if n > 0 else {},
+        "min"        : float(numpy.min(times)) if n > 0 else numpy.nan,
+        "max"        : float(numpy.max(times)) if n > 0 else numpy.nan,
+        "times"      : times
+        })
+
+# summarize the outcomes of run_in_worker for the runs with seeds, in the same order
+def collect(outcomes, seeds, confidence = 0.95):
+    finished = [i for i, (_, report) in enumerate(outcomes) if report is None]
+    results = summarize(times = [outcomes[i][0] for i in finished], confidence = confidence)
+    results["seeds"] = numpy.array([seeds[i] for i in finished], dtype = "int64") # seed of every boarding time
+    results["stalled"] = [report for _, report in outcomes if report is not None]
+    results["stall_fraction"] = len(results["stalled"]) / len(outcomes) if len(outcomes) > 0 else 0.0
+    # the boardings that were stopped are left out of the mean, CI and percentiles, which are then only of the ones that
+    # finished (biased towards the fast ones), so they can't be trusted, and shouldn't be compared
+    results["reliable"] = len(results["stalled"]) == 0
+    return(results)
+
+##################################################
+
+
+# RUNNER
+##################################################
+# board the plane n_runs times, with seeds seed, seed + 1, ..., seed + n_runs - 1
+# the boarding scenario is either zones = [[seat, seat, ...], [seat, ...], ...] or the name of a strategy (with its parameters)
+# processes = None uses every core, 1 runs serially
+# vectorized_ticks = True boards with vectorized.py, discrete_events = True with the (much faster, less detailed) discrete.py
+# every run can take up to max_ticks ticks and max_seconds (wall-clock) seconds; runs that were stopped are left out of the
+# summary, their watchdog reports are in results["stalled"], and results["reliable"] is False (see collect)
+# release (with release_values) calls zones to the boarding queue with a release policy (see release.py) instead of zone after zone
+# traits are the passengers' luggage_ticks and pace_spread (see population.py), with discrete_events
+# store (see results.py) keeps every boarding time, so runs boarded before (by any sweep) are looked up rather than boarded again
+# ex. # results = run(cabin = cabin, strategy = "wilma", n_runs = 500)
+#     print(results["mean"], results["ci"])
+
+def run(cabin, n_runs, zones = None, strategy = None, parameters = {}, seed = 0, processes = None, vectorized_ticks = False, confidence = 0.95, discrete_events = False, max_ticks = None, max_seconds = None,
+        release = None, release_values = (), traits = {}, store = None):
+    if (zones is None) == (strategy is None):
+        raise Exception("scenario exception: Provide exactly one of zones or strategy.")
+    zones = [list(seats) for seats in zones] if zones is not None else None
+    tasks = [task(zones = zones, seed = seed + i, strategy = strategy, parameters = parameters, vectorized_ticks = vectorized_ticks, discrete_events = discrete_events, max_ticks = max_ticks, max_seconds = max_seconds,
+                  release = release, release_values = release_values, traits = traits) for i in range(n_runs)]
+
+    if processes == 1: # no need for a pool
+        initialize_worker(cabin = cabin)
+        outcomes = board_tasks(cabin = cabin, tasks = tasks, store = store)
+    else:
+        with multiprocessing.Pool(processes = processes, initializer = initialize_worker, initargs = (cabin, )) as pool:
+            outcomes = board_tasks(cabin = cabin, tasks = tasks, boarder = lambda function, tasks: pool.map(function, tasks, chunksize = max(1, len(tasks) // (4 * (processes or multiprocessing.cpu_count())))), store = store)
+
+    return(collect(outcomes = outcomes, seeds = [seed + i for i in range(n_runs)], confidence = confidence))
+
+##################################################
+
+
+# COMPARISONS
+##################################################
+# how much longer boarding takes with results than with other (both from run), seed by seed, on the seeds both finished
+# with the same seeds, both boarded the same passengers (common random numbers), so the differences vary far less than
+# the boarding times themselves, and a narrow confidence interval takes far fewer runs; if either had runs that were stopped,
+# the seeds that got stuck are missing, and difference["reliable"] is False
+# ex. # difference = paired(results = run(cabin = cabin, strategy = "wilma", n_runs = 50), other = run(cabin = cabin, strategy = "random", n_runs = 50))
+#     print(difference["mean"], difference["ci"]) # wilma is faster if the whole interval is below 0
+
+def paired(results, other, confidence = 0.95):
+    times = dict(zip(results["seeds"].tolist(), results["times"].tolist()))
+    other_times = dict(zip(other["seeds"].tolist(), other["times"].tolist()))
+    seeds = sorted(set(times.keys()) & set(other_times.keys()))
+    difference = summarize(times = [times[seed] - other_times[seed] for seed in seeds], confidence = confidence)
+    difference["seeds"] = numpy.array(seeds, dtype = "int64")
+    difference["reliable"] = results["reliable"] and other["reliable"]
+    return(difference)
+
+##################################################
+
+
+# SEQUENTIAL
+##################################################
+# board every scenario in batches of seeds (the same seeds for every scenario), and stop boarding a scenario as soon as it is settled:
+# once the confidence interval of its mean is no wider than half_width either side (in ticks), or, with ranking, once it is clearly
+# faster or slower than every other scenario (the confidence interval of their paired difference doesn't include 0), or after max_runs runs;
+# so runs go to the scenarios that are hard to tell apart, not to the ones that obviously aren't; a scenario with runs that were stopped
+# is never settled, and the others aren't ranked against it, since its mean is only of the runs that finished (see collect), and a
+# scenario none of whose runs finish is given up on after its first batch (results["gave_up"])
+# every confidence interval is looked at after every batch, so each is at the confidence level that splits 1 - confidence across every
+# look there could be (Bonferroni), and the chance of any of them missing is at most 1 - confidence (results["confidence"] is the level of each)
+# scenarios = {name: {"strategy": name, "parameters": {...}} or {"zones": [[seat, seat, ...], ...]}}; the other parameters are as in run
+# returns {name: results (see run)}, where results["settled"] is whether the scenario was settled before max_runs, and results["gave_up"]
+# whether it was stopped because none of its runs finish
+# ex. # results = sequential(cabin = cabin, scenarios = {name: {"strategy": name} for name in ("wilma", "steffen", "random")}, discrete_events = True)
+#     print({name: (results[name]["mean"], results[name]["n_runs"]) for name in results})
+
+def sequential(cabin, scenarios, half_width = None, ranking = True, batch = 20, max_runs = 1000, seed = 0, processes = None, confidence = 0.95, vectorized_ticks = False, discrete_events = False,
+               max_ticks = None, max_seconds = None, release = None, release_values = (), traits = {}, store = None, verbose = False):
+    if half_width is None and not ranking:
+        raise Exception("stopping exception: Provide a half_width, a ranking, or both, to know when to stop.")
+    for name, scenario in scenarios.items():
+        if ("zones" in scenario) == ("strategy" in scenario):
+            raise Exception(f"scenario exception: Provide exactly one of zones or strategy for {name}.")
+    confidence = 1 - (1 - confidence) / int(numpy.ceil(max_runs / batch)) # at most one look per batch
+    outcomes = {name: [] for name in scenarios} # outcome of every run so far, in seed order
+    results = {name: collect(outcomes = [], seeds = [], confidence = confidence) for name in scenarios}
+    active = list(scenarios.keys()) # scenarios not settled yet
+
+    # settled once its mean is known well enough, or it is clearly faster or slower than every other scenario
+    def settled(name):
+        if not results[name]["reliable"]:
+            return(False)
+        if half_width is not None and results[name]["n_runs"] > 1 and results[name]["ci"][1] - results[name]["mean"] <= half_width:
+            return(True)
+        if ranking and len(scenarios) > 1:
+            differences = [paired(results = results[name], other = results[other], confidence = confidence) for other in scenarios if other != name and results[other]["reliable"]]
+            return(all(difference["ci"][0] > 0 or difference["ci"][1] < 0 for difference in differences))
+        return(False)
+
+    # board the next batch of seeds of every scenario still going
+    def board(pool):
+        while len(active) > 0:
+            tasks, owners = [], []
+            for name in active:
+                scenario = scenarios[name]
+                for run_seed in range(seed + len(outcomes[name]), seed + min(len(outcomes[name]) + batch, max_runs)):
+                    tasks.append(task(zones = [list(seats) for seats in scenario["zones"]] if "zones" in scenario else None, seed = run_seed, strategy = scenario.get("strategy"), parameters = scenario.get("parameters", {}),
+                                      vectorized_ticks = vectorized_ticks, discrete_events = discrete_events, max_ticks = max_ticks, max_seconds = max_seconds, release = release, release_values = release_values, traits = traits))
+                    owners.append(name)
+            for name, outcome in zip(owners, board_tasks(cabin = cabin, tasks = tasks, boarder = pool.map if pool is not None else map, store = store)):
+                outcomes[name].append(outcome)
+            for name in active:
+                results[name] = collect(outcomes = outcomes[name], seeds = [seed + i for i in range(len(outcomes[name]))], confidence = confidence)
+            for name in list(active):
+                results[name]["settled"] = settled(name = name)
+                results[name]["gave_up"] = results[name]["n_runs"] == 0 # every run was stopped
+                if results[name]["settled"] or results[name]["gave_up"] or len(outcomes[name]) >= max_runs:
+                    active.remove(name)
+            if verbose:
+                stops = {name: f", {len(results[name]['stalled'])} stopped" if not results[name]["reliable"] else "" for name in scenarios}
+                print(", ".join(f"{name}: {results[name]['mean']:.1f} ({results[name]['n_runs']} runs{stops[name]}{'' if name in active else ', done'})" for name in scenarios))
+
+    if processes == 1: # no need for a pool
+        initialize_worker(cabin = cabin)
+        board(pool = None)
+    else:
+        with multiprocessing.Pool(processes = processes, initializer = initialize_worker, initargs = (cabin, )) as pool:
+            board(pool = pool)
+    return(results)
+
+##################################################
@@ -0,0 +1,139 @@
+# OPTIMIZE
+# Search for the fastest way to board a plane with a genetic algorithm.
+
+# A candidate boarding method is a zone assignment: which of n_zones zones every seat boards in (within a zone,
+# passengers line up in whatever order they show up at the gate). Its fitness is its mean boarding time over the same
+# few seeds (so that candidates are compared on the same gate orders), boarded headlessly on a pool of processes,
+# and remembered, so no zone assignment is ever boarded twice. Every generation keeps the best few candidates, and
+# breeds the rest from tournaments: children take every seat's zone from either parent, a few seats are moved to a
+# random zone, and now and then part of one zone is moved into another (so zones can grow, shrink and merge).
+# The first generation is seeded with everyone in one zone and with the zones of the built-in strategies (see strategies.py),
+# which are also boarded as they are on the same seeds, so the best candidate can be held up against them (within a zone, a
+# candidate can't keep a strategy's order, so steffen or random are often faster than any zone assignment). n_zones is the
+# most zones a plan can have.
+
+
+# IMPORTS
+##################################################
+
+import multiprocessing # for the process pool
+from random import Random # for the genetic algorithm
+import numpy # for zone assignments
+from boarding import monte_carlo # for boarding headlessly in workers
+from boarding import population as passengers # for the strategies' generator
+from boarding.strategies import strategies, boarding_plan, zones_from_plan
+
+##################################################
+
+
+# HELPER FUNCTIONS
+##################################################
+
+# turn a zone assignment (zone of every seat in seat_list, from 0) into zones, [[seat, seat, ...], [seat, ...], ...]
+def zones_from_assignment(assignment, seat_list):
+    return(zones_from_plan(plan = [(int(zone), seat) for zone, seat in zip(assignment, seat_list)]))
+
+# turn a strategy's boarding plan into a zone assignment with as many zones as the plan has (at most n_zones, merging
+# neighbouring zones of the plan when it has more), keeping their order
+def assignment_from_plan(plan, seat_list, n_zones):
+    index = dict(((seat, i) for i, seat in enumerate(seat_list)))
+    plan_zones = sorted(set(zone for zone, _ in plan))
+    zone_index = dict(((zone, (i * min(len(plan_zones), n_zones)) // len(plan_zones)) for i, zone in enumerate(plan_zones)))
+    assignment = numpy.zeros(shape = len(seat_list), dtype = "int64")
+    for zone, seat in plan:
+        assignment[index[seat]] = zone_index[zone]
+    return(assignment)
+
+##################################################
+
+
+# OPTIMIZER
+##################################################
+# ex. # best = optimize(cabin = cabin, n_zones = 6, generations = 50)
+#     print(best["plan"], best["results"]["mean"])
+# the simulator is the same as monte_carlo.run's (discrete_events by default, since thousands of boardings are needed), and so is store
+
+def optimize(cabin, n_zones = 6, population_size = 40, generations = 50, n_seeds = 4, elite = 4, tournament = 3, mutation_rate = 0.02, zone_mutation_rate = 0.2,
+             seed = 0, processes = None, vectorized_ticks = False, discrete_events = True, n_runs = 200, store = None, verbose = False):
+    generator = Random(seed)
+    seat_list = list(cabin.seat_list)
+    seeds = [seed + i for i in range(n_seeds)] # same gate orders for every candidate
+    fitnesses = {} # zone assignment (bytes) -> mean boarding time
+
+    # first generation: everyone in one zone, the zones of the built-in strategies, then random zone assignments
+    population = [numpy.zeros(shape = len(seat_list), dtype = "int64"), ]
+    for name in strategies:
+        assignment = assignment_from_plan(plan = boarding_plan(name, cabin = cabin, generator = passengers.generator(seed = seed)), seat_list = seat_list, n_zones = n_zones)
+        if not any(numpy.array_equal(assignment, candidate) for candidate in population):
+            population.append(assignment)
+    while len(population) < population_size:
+        population.append(numpy.array([generator.randrange(n_zones) for _ in seat_list], dtype = "int64"))
+    population = population[:population_size]
+
+    # evolve the population for generations generations, boarding candidates on pool (or in this process, if pool is None);
+    # returns the mean boarding time of every built-in strategy, the best mean boarding time of every generation, the last generation, and its candidates from best to worst
+    def search(pool, population):
+        boarder = (lambda function, tasks: pool.map(function, tasks, chunksize = max(1, len(tasks) // (4 * (processes or multiprocessing.cpu_count()))))) if pool is not None else map
+
+        # the built-in strategies as they are, on the same seeds
+        tasks = [monte_carlo.task(zones = None, seed = run_seed, strategy = name, vectorized_ticks = vectorized_ticks, discrete_events = discrete_events) for name in strategies for run_seed in seeds]
+        times = [ticks if report is None else numpy.inf for ticks, report in monte_carlo.board_tasks(cabin = cabin, tasks = tasks, boarder = boarder, store = store)]
+        baselines = dict(((name, float(numpy.mean(times[(i * n_seeds):((i + 1) * n_seeds)]))) for i, name in enumerate(strategies)))
+
+        # mean boarding time of every candidate, boarding only those never seen before
+        def evaluate(candidates):
+            unseen = list(dict(((candidate.tobytes(), candidate) for candidate in candidates if candidate.tobytes() not in fitnesses)).values())
+            tasks = [monte_carlo.task(zones = zones_from_assignment(assignment = candidate, seat_list = seat_list), seed = run_seed, vectorized_ticks = vectorized_ticks, discrete_events = discrete_events) for candidate in unseen for run_seed in seeds]
+            outcomes = monte_carlo.board_tasks(cabin = cabin, tasks = tasks, boarder = boarder, store = store) if len(tasks) > 0 else []
+            times = [ticks if report is None else numpy.inf for ticks, report in outcomes] # boardings that got stuck are as bad as it gets
+            for i, candidate in enumerate(unseen):
+                fitnesses[candidate.tobytes()] = float(numpy.mean(times[(i * n_seeds):((i + 1) * n_seeds)]))
+            return([fitnesses[candidate.tobytes()] for candidate in candidates])
+
+        history = [] # best mean boarding time of every generation
+        for generation in range(generations):
+            scores = evaluate(candidates = population)
+            ranking = sorted(range(len(population)), key = lambda i: scores[i])
+            history.append(scores[ranking[0]])
+            if verbose:
+                print(f"Generation {generation + 1}: best mean boarding time {scores[ranking[0]]:.1f} ticks ({len(fitnesses)} zone assignments boarded).")
+            if generation == generations - 1:
+                break
+
+            # next generation
+            pick = lambda: min(generator.sample(range(len(population)), k = min(tournament, len(population))), key = lambda i: scores[i])
+            children = [population[i] for i in ranking[:elite]]
+            while len(children) < population_size:
+                mother, father = population[pick()], population[pick()]
+                child = numpy.where(numpy.array([generator.random() < 0.5 for _ in seat_list]), mother, father)
+                for i in range(len(child)):
+                    if generator.random() < mutation_rate:
+                        child[i] = generator.randrange(n_zones)
+                if generator.random() < zone_mutation_rate: # move about half of one zone into another
+                    a, b = generator.randrange(n_zones), generator.randrange(n_zones)
+                    child[(child == a) & numpy.array([generator.random() < 0.5 for _ in seat_list])] = b
+                children.append(child)
+            population = children
+        return(baselines, history, population, ranking)
+
+    if processes == 1: # no need for a pool
+        monte_carlo.initialize_worker(cabin = cabin)
+        baselines, history, population, ranking = search(pool = None, population = population)
+    else:
+        with multiprocessing.Pool(processes = processes, initializer = monte_carlo.initialize_worker, initargs = (cabin, )) as pool:
+            baselines, history, population, ranking = search(pool = pool, population = population)
+
+    # boarding time distribution of the best zone assignment
+    best = population[ranking[0]]
+    zones = zones_from_assignment(assignment = best, seat_list = seat_list)
+    return({
+        "plan"       : [(zone, seat) for zone, seats in enumerate(zones, start = 1) for seat in seats],
+        "zones"      : zones,
+        "fitness"    : fitnesses[best.tobytes()],
+        "history"    : history,
+        "strategies" : baselines, # mean boarding time of every built-in strategy on the same seeds as fitness
+        "evaluations": len(fitnesses),
+        "results"    : monte_carlo.run(cabin = cabin, n_runs = n_runs, zones = zones, seed = seed + n_seeds, processes = processes, vectorized_ticks = vectorized_ticks, discrete_events = discrete_events, store = store)
+        })
+
+##################################################
@@ -0,0 +1,345 @@
+# PLANE
+# Build a plane, from its seat layout to the engine's cabin, without a window.
+
+# airplane_boarding.py used to work out everything about the plane at import time, in between drawing it: the seat layout
+# is cleaned up, compiled into row and column lines (see layout.py), and turned into walls, seats, stairs and a boarding
+# queue for every door, which the engine's cabin is made from. None of that needs a display, tkinter or pandas, so it
+# lives here, and a plane can be built (and boarded, see simulate in __init__.py) by a worker process that never opens a
+# window. A plane keeps every point the window draws (x0, y1_inner, seat_cushions, ...), named as in the diagram below,
+# in passenger diameters: the size of the window only decides how many pixels a passenger diameter is drawn with.
+#
+#                                                             ^
+#                                                  x5         | wfhe
+#                                                             v
+#         (x0, y0)-----------------------x3-----x4-----------------(x1, y0)
+#            |                                                        |
+#            |                                                        |
+# <--wfve--> |                                                        |
+#            |                                                        |
+#            |                                                        |
+#         (x0, y1)-x0_os  x2 x2_os-------x3-----x4-----------------(x1, y1)
+#                    |         |
+#                    |         |                   x5
+#                 (x8, y3)     |
+#                   /     (x2_os,y2)
+#                 /           /
+#               /            /  <---- (x_spawn, y_spawn)
+#              x6-----------x7
+
+
+# IMPORTS
+##################################################
+
+import numpy # for seats and spawning locations
+from itertools import chain # for spawning locations
+from string import ascii_uppercase # to help with seats
+from hashlib import sha256 # for the key of the cabin
+from boarding.layout import compile_layout # compiles seat layouts into the plane's geometry
+from boarding.layout import midpoint # midpoint of two points
+from boarding import engine # for the cabin
+
+##################################################
+
+
+# CONSTANTS
+##################################################
+
+# the default seat layout: (section, seat_layout, n_rows, leg_room, seat_depth), seat_depth and leg_room in terms of passenger diameters
+default_layout = (
+    ("first",           "A BC D",   5,  2.00, 2.00),
+    ("business",        "A BC D",   5,  1.80, 1.80),
+    ("premium economy", "AB CD EF", 5,  1.80, 1.60),
+    ("economy",         "AB CD EF", 20, 1.60, 1.60)
+    )
+
+# the default dimensions of the plane, lengths in passenger diameters (see airplane_boarding.py for what each of these are)
+default_dimensions = {
+    "wall_width"                : 0.20, # how thick walls and arm/backrests are
+    "passenger_outline_width"   : 0.20, # how much of a passenger is outline, which can touch walls
+    "gateway_size"              : 1.50, # MUST BE GREATER THAN 1.00
+    "gate_offset"               : 0.75,
+    "wfve"                      : 1/7, # fraction of the canvas width in front of the plane, where the front door's boarding queue is, MUST BE LESS THAN 1/2
+    "wfve_tail"                 : 1.07 * (1/7), # the tail is slightly longer than wfve
+    "wfhe"                      : 4/10, # fraction of the canvas height on either side of the plane, where the boarding queues are, MUST BE LESS THAN 1/2
+    "seat_coordinate_method"    : 2 # where passengers sit, 1 = midpoint, 2 = some distance from the back of the seat
+    }
+
+# minimum and maximum number of rows (inclusive), in the plane and in a section
+n_row_min, n_row_max = 5, 50
+n_row_section_min, n_row_section_max = 3, n_row_max
+
+##################################################
+
+
+# CLEAN UP THE LAYOUT
+##################################################
+# returns the layout, as a list of [section, seat_layout, n_rows, leg_room, seat_depth], and what had to be changed to make it work (messages)
+
+def clean_layout(layout):
+    layout = [[str(section), str(seat_layout).strip().upper(), int(n_rows), float(leg_room), float(seat_depth)] for section, seat_layout, n_rows, leg_room, seat_depth in layout]
+    records = dict(((record[0], record) for record in layout))
+    messages = []
+
+    # number of seats per row in a section and number of walkways per section
+    n_seats_per_row = dict(((record[0], len("".join(record[1].split()))) for record in layout))
+    n_walkways = set(len(record[1].split()) - 1 for record in layout if record[2] != 0)
+
+    # if n_walkways is not the same across sections where there is rows, then cancel
+    if len(n_walkways) > 1:
+        raise Exception("n_walkways exception: In the sections for which there are rows, the number of walkways is not equal.")
+    if not all(1 <= n <= 2 for n in n_walkways):
+        raise Exception("n_walkways exception: Number of walkways is invalid. The MINIMUM number of walkways is 1; the MAXIMUM is TWO.")
+
+    # adjust if number of rows exceed the defined maximum and minimum amounts
+    n_row = sum(record[2] for record in layout)
+    while (not n_row_min <= n_row <= n_row_max): # while n_row continues to be more or less than maximum/minimum
+        for record in layout[::-1]:
+            if n_row > n_row_max: # if more seats than the maximum
+                if record[2] <= n_row_section_min: # we don't want a single row in a section
+                    continue
+                record[2] -= 1 # subtract one row from this section
+                n_row = sum(record[2] for record in layout) # update n_row
+                messages.append(f"1 row subtracted from {record[0]} class. There are now {record[2]} rows in {record[0]}, and {n_row} rows total.")
+                if n_row_min <= n_row <= n_row_max: # break out of for loop, and thus while loop
+                    break
+            elif n_row < n_row_min:
+                if record[2] >= n_row_section_max or record[2] == 0: # we don't want a bunch of rows in a section, and if there's 0 rows, that's for a reason
+                    continue
+                record[2] += 1 # add one row from this section
+                n_row = sum(record[2] for record in layout) # update n_row
+                messages.append(f"1 row added to {record[0]} class. There are now {record[2]} rows in {record[0]}, and {n_row} rows total.")
+                if n_row_min <= n_row <= n_row_max: # break out of for loop, and thus while loop
+                    break
+
+    # the sections where n_rows != 0
+    sections = [record[0] for record in layout if record[2] != 0]
+
+    # make sure the seats are in alphabetical order from left to right
+    for section in sections:
+        seat_layout_trimmed = "".join(records[section][1].split())
+        if list(seat_layout_trimmed) != sorted(seat_layout_trimmed):
+            letters = iter(ascii_uppercase)
+            records[section][1] = "".join(" " if character == " " else next(letters) for character in records[section][1]) # list out characters in alphabetical order
+
+    # we assume that the section with the most seats per row will be the last one (economy, at the back of the plane, by default), so, we will make this the case
+    widest = sections[-1]
+    if max(n_seats_per_row[section] for section in sections) != n_seats_per_row[widest]:
+        # if the number of seats per row is greater than the last section's in any section, the seat_layout is replaced by the smallest ideal seat layout
+        smallest_ideal_seat_layout = records[min(sections, key = lambda section: n_seats_per_row[section])][1]
+        too_wide = [section for section in sections if n_seats_per_row[section] > n_seats_per_row[widest]]
+        messages.append(f"Changing seat layouts in the following classes: {too_wide}")
+        for section in too_wide:
+            records[section][1] = smallest_ideal_seat_layout
+
+    # each successive section should have greater than equal to number of seats per row than than the row before it
+    for i in range(1, len(sections)):
+        if n_seats_per_row[sections[i]] < n_seats_per_row[sections[i - 1]]: # if this section has less seats per row than the section before it
+            records[sections[i - 1]][1] = records[sections[i]][1] # set the seat layout of the previous row to the same as this one
+            messages.append(f"Seat layout of {sections[i - 1]} class has been altered.")
+
+    return(layout, messages)
+
+##################################################
+
+
+# PLANE
+##################################################
+# everything about a plane that doesn't need a window: the points the window draws, walls, seats, boarding queues and the engine's cabin
+# layout is a list of (section, seat_layout, n_rows, leg_room, seat_depth), like default_layout, and is cleaned up first (see plane.messages);
+# the remaining parameters are handed to engine.cabin; every length is in passenger diameters
+# ex. # airplane = plane(layout = default_layout, n_exits = 2)
+#     ticks = engine.simulation(cabin = airplane.cabin).run(zones = [airplane.seat_list[:20], ...])
+
+class plane:
+
+    def __init__(self, layout = default_layout, n_exits = 1, max_steps = 1, walking_speed = 1.0, door_assignment = "nearest", dimensions = {}):
+        dimensions = dict(default_dimensions, **dimensions)
+        self.dimensions = dimensions
+        wall_width, wfve_tail, wfhe = dimensions["wall_width"], dimensions["wfve_tail"], dimensions["wfhe"]
+        self.wall_width = wall_width
+
+        # CLEAR UP VARIABLES
+        # maximum number of exits is 3; minimum is 1 (the front door)
+        self.n_exits = min(max(int(n_exits), 1), 3)
+        self.layout, self.messages = clean_layout(layout = layout)
+
+        # COMPILE THE LAYOUT
+        # where every row line, column line, seat and walkway goes (see layout.py); compiled layouts are cached on disk
+        geometry = compile_layout(layout = [tuple(record) for record in self.layout], n_exits = self.n_exits, dimensions = dimensions)
+        self.geometry = geometry
+
+        # DEFINE BASIC POINTS FOR PLANE
+        self.canvas_width, self.plane_length = geometry.canvas_width, geometry.plane_length
+        self.x0, self.x1 = geometry.x0, geometry.x1
+        self.row_lines, self.col_lines = geometry.row_lines, geometry.col_lines
+        self.x0_os, self.x2_os = geometry.x0_os, geometry.x2_os # x-values for where the gate intersect the body of the plane
+        self.gateway_width = geometry.gateway_width # size of stairs and walkway and main aisles
+        self.passenger_diameter, self.passenger_radius = geometry.passenger_diameter, geometry.passenger_radius # 1 and 1/2
+        self.plane_width = geometry.plane_width
+        self.has_first_class, self.n_walkways = geometry.has_first_class, geometry.n_walkways
+        x0_os, x2_os, gateway_width, row_lines = self.x0_os, self.x2_os, self.gateway_width, self.row_lines
+
+        self.canvas_height = canvas_height = geometry.canvas_height
+        self.plane_width_halved = (1/2 - wfhe) * canvas_height # plane width divided by 2...duh
+        self.tail_length = wfve_tail * self.canvas_width # tail length
+        self.x_mid, self.y_mid = self.canvas_width / 2, canvas_height / 2
+        self.y0, self.y1 = geometry.y0, geometry.y1
+        self.y0_inner, self.y1_inner = geometry.y0_inner, geometry.y1_inner
+        y0_inner, y1_inner = geometry.y0_inner, geometry.y1_inner
+        self.x3 = self.x_mid - ((1/8) * self.canvas_width) # x-coordinate of the shoulder of wings
+        self.x4 = self.x_mid + ((1/32) * self.canvas_width) # x-coordinate of the armpit of wings
+        self.x5 = self.x_mid + ((1/10) * self.canvas_width) # x-coordinate of the tip of wings
+
+        # CONSTANTS, points to create gate
+        self.x2 = self.x0 + gateway_width
+        self.x7 = x7 = x2_os # x2_os - gateway_width
+        self.x6 = x7 - (6 * gateway_width)
+        self.x8 = x8 = x0_os # x0_os - ((x7 - x6) / 4)
+        self.x9 = x9 = wall_width / 2
+        self.y2 = y2 = (1 - ((1/3) * wfhe)) * canvas_height
+        self.y3 = y3 = y2 - ((3/4) * self.passenger_diameter)
+
+        # points for interior of plane
+        self.x0_inner = x0_inner = row_lines["line"][0] + (wall_width / 2)
+        self.x1_inner = x1_inner = row_lines["line"][-1] - (wall_width / 2)
+
+        # WALLS
+        # gate and walkway to plane
+        self.gate_and_walkway_vertices = ((x2_os, y1_inner), (x2_os, y2), (x7, canvas_height), (x9, canvas_height), (x9, y3), (x8, y3), (x0_os, y1_inner))
+
+        # every other exit (over the wing, at the back) is a door too, with stairs down to a boarding queue of its own,
+        # which reaches back (left) to one gateway width short of the stairs of the door in front of it
+        door_edges = [(row_lines["line"][i], row_lines["line"][i + 1]) for i in numpy.flatnonzero(row_lines["type"] == "exit")[1:]] # (front, back) of every other door
+        self.door_stairs_vertices = [] # outline of the stairs of every other door
+        x_queue_ends = [] # how far back (left) the boarding queue of every other door can reach
+        x_door_in_front = x2_os
+        for x_door_front, x_door_back in door_edges:
+            x_queue_ends.append(x_door_in_front + gateway_width)
+            self.door_stairs_vertices.append(((x_door_back, y1_inner), (x_door_back, canvas_height), (x_queue_ends[-1], canvas_height), (x_queue_ends[-1], y3), (x_door_front, y3), (x_door_front, y1_inner)))
+            x_door_in_front = x_door_back
+
+        # slightly adjust floor frontline when there is no first class
+        x0_inner_temp = x0_os if (not self.has_first_class) else x0_inner
+        self.floor_vertices = ((x0_inner_temp, y0_inner), (x1_inner, y1_inner))
+        self.floor_border_vertices = [[(x0_os, y1_inner), (x0_inner_temp, y1_inner), (x0_inner_temp, y0_inner), (x1_inner, y0_inner), (x1_inner, y1_inner)], ] # polylines, with a gap for every door
+        for x_door_front, x_door_back in door_edges[::-1]: # back to front along the bottom wall
+            if x_door_back < x1_inner:
+                self.floor_border_vertices[-1].append((x_door_back, y1_inner))
+            self.floor_border_vertices.append([(x_door_front, y1_inner), ])
+        self.floor_border_vertices[-1].append((x2_os, y1_inner))
+
+        # SEATS AND AISLES
+        self.seat_cushions = [] # (top left, bottom right) of each group of seat cushions
+        self.seat_outlines = [] # arm/backrests, collidable
+        self.floor_outlines = [] # floor outline behind each row of seats
+        col_lines = self.col_lines
+
+        # get indicies for when new sections begin (adding the first line)
+        section_indicies = [0, ] + list(numpy.flatnonzero(row_lines["section"][1:] != row_lines["section"][:-1]) + 1)
+
+        # loop through each section
+        for i in range(len(section_indicies) - 1): # the last line will always be blank, so we can ignore it
+            section = row_lines["section"][section_indicies[i]]
+            if section in ("exit", "aisle"): # not a normal aisle/seating section
+                continue
+
+            # figure out where walkway is
+            walkway_indicies = list(numpy.flatnonzero(col_lines[section]["type"] == "floor"))
+            walkway_indicies = sorted(walkway_indicies + list([k + 1 for k in walkway_indicies]) + [0, len(col_lines[section]["line"]) - 1])
+            walkway_lines = list(col_lines[section]["line"][walkway_indicies])
+
+            # iterate through each row
+            for k in range(section_indicies[i] + 1, section_indicies[i + 1] + 1, 2): # + 1 because we start on a seat
+
+                # seat cushions and arm/backrests
+                for l in range(0, len(walkway_lines) - 1, 2): # draw the front edge of leg room
+                    # rectangle for seat cushions
+                    self.seat_cushions.append(((row_lines["line"][k], walkway_lines[l]), (row_lines["line"][k + 1], walkway_lines[l + 1])))
+
+                    # create arm/backrests algorithmically
+                    x_seatfront = row_lines["line"][k]
+                    x_seatback = row_lines["line"][k + 1] - (wall_width / 2)
+                    armrests = [(x_seatfront, walkway_lines[l]), (x_seatback, walkway_lines[l])]
+                    for y in list(col_lines[section]["line"][(walkway_indicies[l] + 1):walkway_indicies[l + 1]]):
+                        armrests += [(x_seatback, y), (x_seatfront, y), (x_seatback, y)]
+                    armrests += [(x_seatback, walkway_lines[l + 1]), (x_seatfront, walkway_lines[l + 1])]
+                    self.seat_outlines.append(armrests)
+
+                # floor outline behind seat
+                x = row_lines["line"][k + 1] + (wall_width / 2)
+                for l in range(0, len(walkway_lines) - 1, 2): # draw the front edge of leg room
+                    self.floor_outlines.append(((x, walkway_lines[l]), (x, walkway_lines[l + 1])))
+
+        # everything a passenger can collide with
+        self.walls = [(self.gate_and_walkway_vertices, wall_width), ] + [(vertices, wall_width) for vertices in self.door_stairs_vertices] + [(vertices, wall_width) for vertices in self.floor_border_vertices] + [(armrests, wall_width) for armrests in self.seat_outlines]
+
+        # PASSENGERS
+        self.step = self.passenger_radius / 2 # step size of passengers (in passenger diameters)
+        self.bounding_box_margin = - dimensions["passenger_outline_width"] / 10
+        self.seat_coordinates = geometry.seat_coordinates # {seat: (x, y)}
+        self.seat_list = list(geometry.seat_list) # in order, front to back
+        self.sections = list(geometry.sections) # sections where n_rows != 0
+        self.section_row_numbers = geometry.section_row_numbers # the last row number of each section
+        self.x_walkways, self.y_walkways = geometry.x_walkways, geometry.y_walkways # where each section starts
+
+        # SPAWNING MECHANICS
+        # the front door's boarding queue reaches back to the edge of the window, every other door's to the stairs of the door in front of it
+        self.spawning_locs, self.nrow_spawnpoints = self.boarding_queue(x_spawn = midpoint(x0_os, x2_os), x_end = x9)
+        self.doors = [self.boarding_queue(x_spawn = midpoint(x_door_front, x_door_back), x_end = x_queue_end) for (x_door_front, x_door_back), x_queue_end in zip(door_edges, x_queue_ends)]
+
+        # HEADLESS ENGINE
+        # hand the plane over to the engine as plain Python/NumPy structures
+        self.cabin = engine.cabin(
+            passenger_radius = self.passenger_radius, step = self.step, bounding_box_margin = self.bounding_box_margin,
+            walls = self.walls, spawning_locs = self.spawning_locs, nrow_spawnpoints = self.nrow_spawnpoints,
+            sections = self.sections, section_row_numbers = self.section_row_numbers,
+            section_layouts = dict(((section, geometry.section_layouts[section]) for section in self.sections)),
+            has_first_class = self.has_first_class, n_walkways = self.n_walkways,
+            x_walkways = self.x_walkways, y_walkways = self.y_walkways,
+            row_x = geometry.row_x, seat_coordinates = self.seat_coordinates,
+            max_steps = max_steps, walking_speed = walking_speed,
+            doors = self.doors, door_assignment = door_assignment,
+            key = sha256(repr((geometry.key, int(max_steps), float(walking_speed), str(door_assignment))).encode("utf-8")).hexdigest()
+            )
+
+    # possible spawning locations of the boarding queue in front of a door at x_spawn, in a snake that reaches back (left) to x_end
+    # returns the spawning locations, front of the queue first, and how long every column of the snake is
+    def boarding_queue(self, x_spawn, x_end):
+        spawning_loc_step = 2 * self.passenger_diameter
+        y_spawn = self.y3 + (spawning_loc_step / 2)
+        x_spawnpoints = numpy.arange(start = x_spawn - (((x_spawn - (x_end + (spawning_loc_step / 2))) // spawning_loc_step) * spawning_loc_step),
+                                     stop = x_spawn + (spawning_loc_step / 2),
+                                     step = spawning_loc_step)[::-1]
+        y_spawnpoints = numpy.arange(start = y_spawn,
+                                     stop = y_spawn + ((((self.canvas_height - (spawning_loc_step / 2)) - y_spawn) // spawning_loc_step) * spawning_loc_step) + (spawning_loc_step / 2),
+                                     step = spawning_loc_step)
+
+        # convert into matrix
+        spawning_locs = numpy.zeros(shape = (len(x_spawnpoints), len(y_spawnpoints), 2))
+        for i, x_spawnpoint in enumerate(x_spawnpoints):
+            for j, y_spawnpoint in enumerate(y_spawnpoints):
+                spawning_locs[i, j, :] = (x_spawnpoint, y_spawnpoint)
+
+        # make it snake formation by reversing every other column
+        for i in range(1, len(spawning_locs), 2):
+            spawning_locs[i] = spawning_locs[i][::-1]
+
+        # flatten
+        return(tuple(map(lambda coords: tuple(coords), chain.from_iterable(spawning_locs))), len(y_spawnpoints))
+
+##################################################
+
+
+# BUILD
+##################################################
+# a plane, built once per process for every set of parameters, so that many boardings of the same plane only pay for it once
+
+planes = {} # parameters -> plane
+
+def build_plane(layout = default_layout, n_exits = 1, max_steps = 1, walking_speed = 1.0, door_assignment = "nearest", dimensions = {}):
+    key = repr((tuple(map(tuple, layout)), n_exits, max_steps, walking_speed, door_assignment, sorted(dimensions.items())))
+    if key not in planes:
+        planes[key] = plane(layout = layout, n_exits = n_exits, max_steps = max_steps, walking_speed = walking_speed, door_assignment = door_assignment, dimensions = dimensions)
+    return(planes[key])
+
+##################################################
@@ -0,0 +1,99 @@
+# RELEASE
+# When passengers are called to the boarding queue.
+
+# By default, a zone is only called once everyone called before them is in their seat, so zones board strictly one after
+# the other, and the boarding queue runs dry while the last few passengers of every zone find their seats. A release
+# policy can instead call the next zone while the one before is still seating. A release policy is an object with a method
+#     release(ticks, released, seated, zone_ends) -> how many passengers (in boarding order) have been called by now
+# where ticks is how long boarding has been going, released how many passengers have been called so far, seated how many
+# of those are in their seats, and zone_ends the number of passengers up to the end of every zone, e.g. [20, 40, ...].
+# Passengers who are called line up at the back of the boarding queue (see engine.simulation.boarding).
+# Policies are kept in the policies dictionary by name, like strategies (see strategies.py):
+#
+#     from boarding.release import register
+#     @register("half_seated")
+#     class half_seated:
+#         def release(self, ticks, released, seated, zone_ends):
+#             return(next_zone(released = released, zone_ends = zone_ends) if 2 * seated >= released else released)
+
+
+# REGISTRY
+##################################################
+
+policies = {} # name -> release policy class
+
+# decorator to add a release policy to the registry
+def register(name):
+    def add_to_registry(policy):
+        policies[name] = policy
+        return(policy)
+    return(add_to_registry)
+
+# a new release policy by name, e.g. release_policy("overlap", passengers = 10)
+def release_policy(name, *values, **parameters):
+    if name not in policies:
+        raise Exception(f"release exception: There is no release policy called {name}. The release policies are: {', '.join(policies.keys())}.")
+    return(policies[name](*values, **parameters))
+
+##################################################
+
+
+# HELPER FUNCTIONS
+##################################################
+
+# how many passengers have been called once the next zone is called
+def next_zone(released, zone_ends):
+    return(next((end for end in zone_ends if end > released), released))
+
+##################################################
+
+
+# RELEASE POLICIES
+##################################################
+
+# call the next zone once everyone called before them is seated (the default)
+@register("barrier")
+class barrier:
+
+    def release(self, ticks, released, seated, zone_ends):
+        return(next_zone(released = released, zone_ends = zone_ends) if seated == released else released)
+
+# call the next zone once no more than passengers of those called before them are still on their way
+@register("overlap")
+class overlap:
+
+    def __init__(self, passengers = 10):
+        self.passengers = passengers
+
+    def release(self, ticks, released, seated, zone_ends):
+        return(next_zone(released = released, zone_ends = zone_ends) if released - seated <= self.passengers else released)
+
+# call a zone every ticks ticks, however far the zones before them have got
+@register("interval")
+class interval:
+
+    def __init__(self, ticks = 500):
+        self.ticks = ticks
+        self.last_release = None # when the last zone was called
+
+    def release(self, ticks, released, seated, zone_ends):
+        if self.last_release is not None and ticks - self.last_release < self.ticks:
+            return(released)
+        self.last_release = ticks
+        return(next_zone(released = released, zone_ends = zone_ends))
+
+# a gate agent lets one passenger through every ticks ticks, zone after zone
+@register("pacing")
+class pacing:
+
+    def __init__(self, ticks = 20):
+        self.ticks = ticks
+        self.last_release = None # when the last passenger was let through
+
+    def release(self, ticks, released, seated, zone_ends):
+        if (self.last_release is not None and ticks - self.last_release < self.ticks) or released >= zone_ends[-1]:
+            return(released)
+        self.last_release = ticks
+        return(released + 1)
+
+##################################################
@@ -0,0 +1,126 @@
+# RESULTS
+# Keep every boarding time ever simulated, so no run is ever boarded twice.
+
+# A run is fully determined by its scenario (the plane, the engine, the zones or strategy with its parameters, the release
+# policy, the passengers' traits and the budget of ticks) and its seed (see population.py), so its boarding time can be
+# stored under those and looked up instead of boarded again. The store is a SQLite database with one row per run, keyed
+# by a hash of the scenario and the seed; the plane is identified by the hash of its compiled geometry (see layout.py),
+# which covers the seat layout and the number of exits. So re-running a sweep after adding a strategy to it only boards
+# the new strategy. Only the process that runs the sweep touches the store, never the workers. Runs stopped for going over
+# their budget of wall-clock seconds depend on how busy the machine was, so those are never stored.
+
+
+# IMPORTS
+##################################################
+
+import os # for the store's directory
+import sqlite3 # for the store
+import pickle # for watchdog reports
+from hashlib import sha256 # for scenario keys
+import numpy # for boardings that were stopped
+
+##################################################
+
+
+# CONSTANTS
+##################################################
+
+# bump whenever an engine, a strategy or population.py changes how long boarding takes, so old boarding times are not reused
+results_version = 3
+
+# where boarding times are kept
+store_path = os.path.join(os.path.expanduser("~"), ".cache", "airplane_boarding", "results.sqlite")
+
+##################################################
+
+
+# KEYS
+##################################################
+
+# hash of everything a run of a worker task (see monte_carlo.task) depends on but its seed
+# max_seconds is left out, since a run that finishes would have finished with any budget of seconds, and a run that doesn't isn't stored
+def scenario_key(cabin, task):
+    if cabin.key is None:
+        raise Exception("results exception: Only cabins built by plane.py have a key to store boarding times under.")
+    zones, _, vectorized_ticks, strategy, parameters, discrete_events, max_ticks, _, release, release_values, traits = task
+    scenario = (
+        results_version,
+        cabin.key,
+        "discrete" if discrete_events else ("vectorized" if vectorized_ticks else "agent"),
+        tuple(tuple(map(str, seats)) for seats in zones) if zones is not None else None,
+        strategy,
+        tuple(sorted(parameters.items())),
+        max_ticks,
+        release,
+        tuple(release_values),
+        tuple(sorted(((str(name), float(value)) for name, value in traits.items() if value != 0))) # no luggage is the same as luggage taking 0 ticks
+        )
+    return(sha256(repr(scenario).encode("utf-8")).hexdigest())
+
+##################################################
+
+
+# STORE
+##################################################
+# boarding times by scenario and seed, in a SQLite database at path (":memory:" for one that is thrown away)
+# outcomes are as returned by monte_carlo.run_in_worker: (ticks, None), or (nan, the watchdog's report) for a boarding that was stopped
+# ex. # runs = store()
+#     outcomes = runs.lookup(cabin = cabin, tasks = tasks) # None for every task that wasn't boarded before
+#     runs.save(cabin = cabin, tasks = tasks, outcomes = outcomes)
+
+class store:
+
+    def __init__(self, path = store_path):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+        self.connection = sqlite3.connect(path, timeout = 60) # wait for other sweeps writing to the same store
+        self.connection.execute("CREATE TABLE IF NOT EXISTS runs (scenario TEXT, seed INTEGER, ticks REAL, report BLOB, PRIMARY KEY (scenario, seed))")
+        self.connection.commit()
+
+    # the stored outcome of every task, None for every task that wasn't boarded before
+    def lookup(self, cabin, tasks):
+        keys = {} # tasks of the same scenario only differ in their seed, so every scenario is only hashed once
+        outcomes = []
+        for task in tasks:
+            scenario = repr(task[:1] + task[2:])
+            if scenario not in keys:
+                keys[scenario] = scenario_key(cabin = cabin, task = task)
+            row = self.connection.execute("SELECT ticks, report FROM runs WHERE scenario = ? AND seed = ?", (keys[scenario], int(task[1]))).fetchone()
+            if row is None:
+                outcomes.append(None)
+            elif row[1] is None: # finished
+                outcomes.append((row[0], None))
+            else: # stopped
+                outcomes.append((numpy.nan, pickle.loads(row[1])))
+        return(outcomes)
+
+    # store the outcome of every task
+    def save(self, cabin, tasks, outcomes):
+        keys = {}
+        rows = []
+        for task, (ticks, report) in zip(tasks, outcomes):
+            if report is not None and report["reason"] == "time budget": # depends on the machine, not the scenario
+                continue
+            scenario = repr(task[:1] + task[2:])
+            if scenario not in keys:
+                keys[scenario] = scenario_key(cabin = cabin, task = task)
+            rows.append((keys[scenario], int(task[1]), float(ticks) if report is None else None, pickle.dumps(report) if report is not None else None))
+        self.connection.executemany("INSERT OR REPLACE INTO runs (scenario, seed, ticks, report) VALUES (?, ?, ?, ?)", rows)
+        self.connection.commit()
+
+    # how many runs are stored
+    def __len__(self):
+        return(self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0])
+
+    def close(self):
+        self.connection.close()
+
+# a store at path, or None if there can't be one there (no store, no problem: every run is just boarded)
+def open_store(path = store_path):
+    try:
+        return(store(path = path))
+    except (OSError, sqlite3.Error):
+        return(None)
+
+##################################################
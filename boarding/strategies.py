@@ -0,0 +1,164 @@
+# STRATEGIES
+# Boarding methods: who boards in which zone, and in what order.
+
+# A strategy is a function strategy(cabin, generator, **parameters) that returns the boarding plan,
+# an ordered list of (zone, seat) pairs: zone 1 boards first, and within a zone, passengers line up
+# in the order of the list. generator is a numpy.random.Generator (see population.py), for strategies that leave some order to chance.
+# Strategies are kept in the strategies dictionary by name, so new ones can be added from outside this module:
+#
+#     from boarding.strategies import register
+#     @register("odd_rows_first")
+#     def odd_rows_first(cabin, generator):
+#         return([(1 if int(seat[:-1]) % 2 == 1 else 2, seat) for seat in cabin.seat_list])
+
+
+# IMPORTS
+##################################################
+
+import numpy # default generator
+from boarding.population import seat_order # for common random numbers
+
+##################################################
+
+
+# REGISTRY
+##################################################
+
+strategies = {} # name -> strategy function
+
+# decorator to add a strategy to the registry
+def register(name):
+    def add_to_registry(strategy):
+        strategies[name] = strategy
+        return(strategy)
+    return(add_to_registry)
+
+# get the boarding plan of a strategy by name
+def boarding_plan(name, cabin, generator = None, **parameters):
+    if name not in strategies:
+        raise Exception(f"strategy exception: There is no strategy called {name}. The strategies are: {', '.join(strategies.keys())}.")
+    return(strategies[name](cabin = cabin, generator = generator if generator is not None else numpy.random.default_rng(), **parameters))
+
+# turn a boarding plan into zones, [[seat, seat, ...], [seat, ...], ...], in boarding order
+def zones_from_plan(plan):
+    zones = {}
+    for zone, seat in plan:
+        zones.setdefault(zone, []).append(seat)
+    return([zones[zone] for zone in sorted(zones.keys())])
+
+##################################################
+
+
+# HELPER FUNCTIONS
+##################################################
+
+# describe every seat of the plane: {seat: (row, block, aisle_distance, is_window)}
+# block is which group of seats between walkways the seat is in (0 = the first letters)
+# aisle_distance is the number of seats between this seat and the closest walkway
+def seat_descriptions(cabin):
+    descriptions = {}
+    for seat in cabin.seat_list:
+        row, col = int(seat[:-1]), seat[-1]
+        blocks = cabin.section_layouts[cabin.which_section(row_number = row)].split()
+        block = next(i for i, letters in enumerate(blocks) if col in letters)
+        i, length = blocks[block].index(col), len(blocks[block])
+        if block == 0: # walkway only to the right
+            aisle_distance = length - 1 - i
+        elif block == len(blocks) - 1: # walkway only to the left
+            aisle_distance = i
+        else: # walkways on either side
+            aisle_distance = min(i, length - 1 - i)
+        is_window = (block == 0 and i == 0) or (block == len(blocks) - 1 and i == length - 1)
+        descriptions[seat] = (row, block, aisle_distance, is_window)
+    return(descriptions)
+
+# rank every seat from window (0) to aisle: windows first, then seats further from the walkway before those closer to it
+def seat_type_ranks(cabin):
+    descriptions = seat_descriptions(cabin = cabin)
+    keys = {seat: ((0, 0) if is_window else (1, -aisle_distance)) for seat, (row, block, aisle_distance, is_window) in descriptions.items()}
+    ranks = dict(((key, rank) for rank, key in enumerate(sorted(set(keys.values())))))
+    return({seat: ranks[keys[seat]] for seat in keys})
+
+# split rows into n_blocks roughly equal blocks of consecutive rows, from the back (0) to the front
+def row_blocks_from_back(cabin, n_blocks):
+    rows = sorted(set(int(seat[:-1]) for seat in cabin.seat_list), reverse = True)
+    n_blocks = max(1, min(n_blocks, len(rows)))
+    return({row: (i * n_blocks) // len(rows) for i, row in enumerate(rows)})
+
+# within every zone, shuffle passengers: every seat gets a random number, drawn in the same order of seats whatever the strategy,
+# and passengers line up by it, so strategies with generators seeded alike see passengers show up in the same order (see population.py)
+def shuffle_within_zones(plan, generator):
+    seats = seat_order(seats = [seat for zone, seat in plan])
+    arrival = dict(zip(seats, generator.random(len(seats)).tolist()))
+    zones = zones_from_plan(plan = plan)
+    return([(zone, seat) for zone, seats in enumerate(zones, start = 1) for seat in sorted(seats, key = lambda seat: arrival[seat])])
+
+##################################################
+
+
+# STRATEGIES
+##################################################
+
+# the seats in order, front to back, in zones of zone_size passengers (the default of airplane_boarding.py)
+@register("front_to_back")
+def front_to_back(cabin, generator, zone_size = 20):
+    return([((i // zone_size) + 1, seat) for i, seat in enumerate(cabin.seat_list)])
+
+# rows split into n_zones blocks, the back block boards first
+@register("back_to_front")
+def back_to_front(cabin, generator, n_zones = 6):
+    blocks = row_blocks_from_back(cabin = cabin, n_blocks = n_zones)
+    plan = sorted(((blocks[int(seat[:-1])] + 1, seat) for seat in cabin.seat_list), key = lambda zone_seat: zone_seat[0])
+    return(shuffle_within_zones(plan = plan, generator = generator))
+
+# everyone in one zone, in a random order
+@register("random")
+def random(cabin, generator):
+    return(shuffle_within_zones(plan = [(1, seat) for seat in cabin.seat_list], generator = generator))
+
+# WilMA: window seats, then middle seats, then aisle seats
+@register("wilma")
+def wilma(cabin, generator):
+    ranks = seat_type_ranks(cabin = cabin)
+    plan = sorted(((ranks[seat] + 1, seat) for seat in cabin.seat_list), key = lambda zone_seat: zone_seat[0])
+    return(shuffle_within_zones(plan = plan, generator = generator))
+
+# Steffen: window seats before middle seats before aisle seats; for each of those, every other row from back to front,
+# one side of the plane (block of seats) at a time, then the rows in between; everyone is in one zone, lined up in that
+# order, so the next group fills in behind the one before instead of waiting for it to be seated
+@register("steffen")
+def steffen(cabin, generator):
+    ranks = seat_type_ranks(cabin = cabin)
+    descriptions = seat_descriptions(cabin = cabin)
+    last_row = max(row for row, block, aisle_distance, is_window in descriptions.values())
+    groups = {}
+    for seat, (row, block, aisle_distance, is_window) in descriptions.items():
+        groups.setdefault((ranks[seat], (last_row - row) % 2, block), []).append(seat)
+    plan = []
+    for key in sorted(groups.keys()):
+        plan += [(1, seat) for seat in sorted(groups[key], key = lambda seat: int(seat[:-1]), reverse = True)] # back to front
+    return(plan)
+
+# reverse pyramid: back rows and window seats first, working diagonally toward the front rows and aisle seats
+@register("reverse_pyramid")
+def reverse_pyramid(cabin, generator, n_row_blocks = 4):
+    ranks = seat_type_ranks(cabin = cabin)
+    blocks = row_blocks_from_back(cabin = cabin, n_blocks = n_row_blocks)
+    plan = sorted(((ranks[seat] + blocks[int(seat[:-1])] + 1, seat) for seat in cabin.seat_list), key = lambda zone_seat: zone_seat[0])
+    return(shuffle_within_zones(plan = plan, generator = generator))
+
+# by section, front to back, with the last section split in half
+@register("by_section")
+def by_section(cabin, generator):
+    zone_of_row = {}
+    for i, section in enumerate(cabin.sections):
+        first_row = cabin.section_row_numbers[i - 1] + 1 if i > 0 else 1
+        last_row = cabin.section_row_numbers[i]
+        for row in range(first_row, last_row + 1):
+            zone_of_row[row] = i + 1
+            if i == len(cabin.sections) - 1 and (row - first_row) >= (last_row - first_row + 1) / 2: # back half of the last section
+                zone_of_row[row] = i + 2
+    plan = sorted(((zone_of_row[int(seat[:-1])], seat) for seat in cabin.seat_list), key = lambda zone_seat: zone_seat[0])
+    return(shuffle_within_zones(plan = plan, generator = generator))
+
+##################################################
@@ -0,0 +1,211 @@
+# VECTORIZED
+# Batched boarding simulation, one tick for every passenger at once.
+
+# Instead of one passenger object per person, every passenger of a zone is a row in a handful of
+# NumPy arrays (structure of arrays): positions, target point indicies, targets and status flags.
+# A tick advances every moving passenger with vectorized operations, following the same rule as
+# engine.passenger.move_to_target: move along the axis with the farther distance first, and if that
+# move is blocked, try the other axis. Moves are checked against where everyone was at the start of the
+# tick and against the moves of passengers ahead of them in the boarding order, so results are comparable to
+# (though not tick-for-tick identical with) the one-at-a-time engine.
+
+
+# IMPORTS
+##################################################
+
+import numpy # for structure of arrays
+from boarding.watchdog import watchdog # for stopping boardings that can't finish
+
+##################################################
+
+
+# SIMULATION
+##################################################
+# one boarding of one plane, same interface as engine.simulation (without an observer), including its watchdog
+# ex. # ticks = simulation(cabin = cabin).run(zones = [seat_list[:20], seat_list[20:40], ...])
+
+class simulation:
+
+    def __init__(self, cabin, stall_ticks = 1000, max_ticks = None, max_seconds = None):
+        if cabin.max_steps != 1:
+            raise Exception("vectorized exception: passengers take one step a tick here, so the cabin needs max_steps = 1.")
+        self.cabin = cabin
+        self.watchdog = watchdog(stall_ticks = stall_ticks, max_ticks = max_ticks, max_seconds = max_seconds)
+        self.zone = 0 # how many zones have started boarding
+        self.reach = cabin.passenger_radius + cabin.bounding_box_margin # how close another passenger's edge can get
+        self.seated = numpy.zeros(shape = (0, 2)) # positions of passengers seated in earlier zones
+        self.spawnpoint_indices = [0, ] * len(cabin.doors) # where in every door's boarding queue the next passenger spawns
+        self.ticks = 0 # number of times every passenger in a zone has had the chance to move
+
+        # the plane is far longer one way than the other, so passengers are sorted along that axis to find who is close to whom (see close_pairs)
+        self.long_axis = int(numpy.argmax(numpy.ptp(numpy.array(list(cabin.seat_coordinates.values()), dtype = "float64").reshape(-1, 2), axis = 0)))
+
+        # longest possible list of target points: the longest way through the boarding queue, then the longest way to a seat (see the cabin's route table)
+        self.max_target_points = max(len(route) for door in cabin.doors for route in door.queue_routes) + max(map(len, cabin.routes.values()))
+
+    # SOA HELPERS
+    ##############################################
+
+    # which of points are closer than distance to which of others? returns the pairs as (indices into points, indices into others)
+    # others are sorted along the length of the plane, so every point is only measured against the few others within distance
+    # of it along that axis (a window found by binary search), not against everyone on the plane
+    def close_pairs(self, points, others, distance):
+        if len(points) == 0 or len(others) == 0:
+            return(numpy.zeros(shape = 0, dtype = "int64"), numpy.zeros(shape = 0, dtype = "int64"))
+        axis = self.long_axis
+        order = numpy.argsort(others[:, axis], kind = "stable")
+        keys = others[order, axis]
+        margin = distance * (1 + 1e-9) # a little wider than distance, so rounding never leaves anyone close out of the window
+        start = numpy.searchsorted(keys, points[:, axis] - margin, side = "right")
+        stop = numpy.searchsorted(keys, points[:, axis] + margin, side = "left")
+        width = int((stop - start).max())
+        if width == 0:
+            return(numpy.zeros(shape = 0, dtype = "int64"), numpy.zeros(shape = 0, dtype = "int64"))
+        window = start[:, numpy.newaxis] + numpy.arange(width)[numpy.newaxis, :] # (len(points), width)
+        in_window = window < stop[:, numpy.newaxis]
+        neighbours = order[numpy.minimum(window, len(order) - 1)]
+        close = in_window & (numpy.hypot(points[:, 0, numpy.newaxis] - others[neighbours, 0], points[:, 1, numpy.newaxis] - others[neighbours, 1]) < distance)
+        k, j = numpy.nonzero(close)
+        return(k, neighbours[k, j])
+
+    # which of the proposed moves (movers[k] to proposals[k]) are free of walls and other passengers?
+    # positions, spawned are the arrays of the zone; movers are in boarding order, which is their priority
+    def free(self, movers, proposals, positions, spawned):
+
+        # walls and arm/backrests
+        free = ~self.cabin.obstacles.collides_many(points = proposals)
+
+        # passengers where they are now (zone passengers that haven't spawned yet don't count), then where the movers would be;
+        # both in one search, so the passengers are only sorted once
+        present = numpy.flatnonzero(spawned)
+        others = numpy.concatenate((positions[present], self.seated, proposals), axis = 0)
+        indices = numpy.concatenate((present, numpy.full(shape = len(self.seated), fill_value = -1, dtype = "int64")), axis = 0) # index of every passenger in positions (-1 when seated in an earlier zone)
+        k, l = self.close_pairs(points = proposals, others = others, distance = 2 * self.reach)
+        n_present = len(indices)
+        now, ahead = l < n_present, l >= n_present
+        free[k[now][indices[l[now]] != movers[k[now]]]] = False # passengers can't collide with themselves
+
+        # passengers ahead in the boarding order get the space first
+        k, l = k[ahead], l[ahead] - n_present
+        conflicts = (l < k) & free[l] # mover k's move overlaps the (possible) move of mover l, who is ahead of them
+        free[k[conflicts]] = False
+
+        return(free)
+
+    # try to move every mover along its axis (0 = x, 1 = y) by the distance in d (limited to one step); returns which actually moved
+    def move_axis(self, movers, axis, d, positions, spawned):
+        step = self.cabin.step
+        d = numpy.where(numpy.abs(d) > step, numpy.sign(d) * step, d) # if a large distance is inputted, only travel the maximum amount the passenger can
+        proposals = positions[movers].copy()
+        proposals[numpy.arange(len(movers)), axis] += d
+        free = self.free(movers = movers, proposals = proposals, positions = positions, spawned = spawned)
+        moved = free & (proposals[numpy.arange(len(movers)), axis] != positions[movers, axis])
+        positions[movers[free]] = proposals[free]
+        return(moved)
+
+    # would a passenger of the zone (k) centered at center overlap a wall or another passenger?
+    def collision_detected(self, k, center, positions, spawned):
+        if self.cabin.obstacles.collides(point = center):
+            return(True)
+        others = numpy.concatenate((positions[spawned & (numpy.arange(len(positions)) != k)], self.seated), axis = 0)
+        return(bool(numpy.any(numpy.hypot(others[:, 0] - center[0], others[:, 1] - center[1]) < 2 * self.reach)))
+
+    ##############################################
+
+    # BOARDING
+    ##############################################
+
+    # board a zone of passengers, returns once all of them are in their seats
+    def board(self, seats):
+        cabin = self.cabin
+        door_spawning_locs = [numpy.array(door.spawning_locs, dtype = "float64") for door in cabin.doors]
+        n = len(seats)
+        self.spawnpoint_indices = [0, ] * len(cabin.doors)
+        self.zone += 1
+
+        # structure of arrays
+        doors = numpy.array([cabin.seat_doors[seat] for seat in seats], dtype = "int64") # door every passenger boards through
+        positions = numpy.array([door_spawning_locs[door][0] for door in doors], dtype = "float64").reshape(n, 2) # coordinates of passengers
+        target_points = numpy.zeros(shape = (n, self.max_target_points, 2)) # every passenger's list of target points
+        n_target_points = numpy.zeros(shape = n, dtype = "int64")
+        tpi = numpy.zeros(shape = n, dtype = "int64") # target point indicies
+        spawned = numpy.zeros(shape = n, dtype = "bool")
+        reached_current_target = numpy.zeros(shape = n, dtype = "bool")
+        in_seat = numpy.zeros(shape = n, dtype = "bool")
+        queues = [numpy.flatnonzero(doors == door).tolist() for door in range(len(cabin.doors))] # passengers of every door, in boarding order
+        next_up = [0, ] * len(cabin.doors) # how many passengers of every door have spawned
+
+        while not in_seat.all():
+
+            # spawning mechanics, one at a time in boarding order, since each spawn moves the spawnpoint index of its door
+            # passengers line up behind whoever spawned before them at their door (spawnpoint indicies never go back), like engine.simulation.free_spawnpoint;
+            # only the first passenger yet to spawn at every door can, so every tick only looks at those, and stops at a door once its boarding queue is full
+            just_spawned = numpy.zeros(shape = n, dtype = "bool")
+            open_doors = [door for door in range(len(queues)) if next_up[door] < len(queues[door])] # doors whose boarding queue isn't full this tick
+            while len(open_doors) > 0:
+                door = min(open_doors, key = lambda door: queues[door][next_up[door]]) # whoever is first in the boarding order
+                k = queues[door][next_up[door]]
+                spawning_locs = door_spawning_locs[door]
+                while self.spawnpoint_indices[door] < len(spawning_locs) - 1 and self.collision_detected(k = k, center = spawning_locs[self.spawnpoint_indices[door]], positions = positions, spawned = spawned): # if spawning location is occupied
+                    self.spawnpoint_indices[door] += 1
+                if self.collision_detected(k = k, center = spawning_locs[self.spawnpoint_indices[door]], positions = positions, spawned = spawned): # if final spawning location is occupied
+                    open_doors.remove(door) # wait until next tick to try to spawn, and so does everyone behind them at this door
+                    continue
+                positions[k] = spawning_locs[self.spawnpoint_indices[door]]
+                route = cabin.target_points(seat = seats[k], spawnpoint_index = self.spawnpoint_indices[door])
+                target_points[k, :len(route)] = route
+                n_target_points[k] = len(route)
+                spawned[k], just_spawned[k] = True, True
+                next_up[door] += 1
+                if next_up[door] == len(queues[door]):
+                    open_doors.remove(door)
+
+            # passengers who reached their current target move on to the next one, or sit down if it was their seat
+            moving = spawned & ~in_seat & ~just_spawned
+            finished = moving & reached_current_target & (tpi >= n_target_points - 1)
+            in_seat |= finished
+            advancing = moving & reached_current_target & ~finished
+            tpi[advancing] += 1
+            reached_current_target[advancing] = False
+            movers = numpy.flatnonzero(moving & ~finished)
+
+            if len(movers) > 0:
+                targets = target_points[movers, tpi[movers]]
+                distance = targets - positions[movers]
+                vertical_first = numpy.abs(distance[:, 1]) >= numpy.abs(distance[:, 0]) # if the y distance is farther than x distance
+
+                # move along the axis with the farther distance, and if that didn't work, along the other axis
+                axis = numpy.where(vertical_first, 1, 0)
+                moved = self.move_axis(movers = movers, axis = axis, d = distance[numpy.arange(len(movers)), axis], positions = positions, spawned = spawned)
+                if not moved.all():
+                    stuck, axis = movers[~moved], 1 - axis[~moved]
+                    moved[~moved] = self.move_axis(movers = stuck, axis = axis, d = (targets[~moved] - positions[stuck])[numpy.arange(len(stuck)), axis], positions = positions, spawned = spawned)
+
+                # update whether passengers reached their targets
+                reached_current_target[movers] = numpy.all(positions[movers] == targets, axis = 1)
+
+            self.ticks += 1
+
+            # has anyone moved, spawned or sat down?
+            progressed = just_spawned.any() or finished.any() or (len(movers) > 0 and moved.any())
+            self.watchdog.check(ticks = self.ticks, progressed = progressed, describe = lambda: {
+                "zone"      : self.zone,
+                "seated"    : len(self.seated) + int(numpy.sum(in_seat)),
+                "waiting"   : int(numpy.sum(~spawned)),
+                "stuck"     : [{"seat": seats[k], "coords": tuple(positions[k]), "target": tuple(target_points[k, tpi[k]]), "blocked_by": []} for k in numpy.flatnonzero(spawned & ~in_seat)],
+                "blocked_by": {}
+                })
+
+        # this zone is now part of the scenery
+        self.seated = numpy.concatenate((self.seated, positions), axis = 0)
+        return(self.ticks)
+
+    # board zone after zone, zones = [[seat, seat, ...], [seat, ...], ...]; returns total number of ticks
+    def run(self, zones):
+        for seats in zones:
+            self.board(seats = seats)
+        return(self.ticks)
+
+    ##############################################
+
+##################################################
@@ -0,0 +1,105 @@
+# WATCHDOG
+# Stop boardings that can't finish, or that take too long.
+
+# Boarding can get stuck for good: two passengers that need each other's spot where walkways meet, or a boarding
+# queue with nowhere left to go. An engine tells its watchdog after every tick whether anyone got anywhere (moved,
+# spawned or sat down). Once nobody has for stall_ticks ticks, the engine knows nobody ever can again, or boarding is
+# over its budget of ticks or (wall-clock) seconds, the watchdog raises stalled, with a report of where boarding got stuck,
+# so that a batch of boardings can write the run off and move on instead of spinning forever.
+
+
+# IMPORTS
+##################################################
+
+from time import perf_counter # for the wall-clock budget
+
+##################################################
+
+
+# HELPER FUNCTIONS
+##################################################
+
+# a cycle in blocked_by = {seat: [seats in the way, ...], ...}, as [seat, seat, ..., seat] (first and last the same), or [] if there isn't one
+def blocking_cycle(blocked_by):
+    state = {} # seat -> 1 (being looked at) or 2 (done)
+    for start in blocked_by:
+        if start in state:
+            continue
+        path, stack = [], [(start, iter(blocked_by.get(start, ())))]
+        state[start] = 1
+        path.append(start)
+        while len(stack) > 0:
+            seat, blockers = stack[-1]
+            blocker = next(blockers, None)
+            if blocker is None: # every way out of seat is a dead end
+                state[seat] = 2
+                stack.pop()
+                path.pop()
+            elif state.get(blocker) == 1: # back to a seat on the current path
+                return(path[path.index(blocker):] + [blocker, ])
+            elif blocker not in state:
+                state[blocker] = 1
+                path.append(blocker)
+                stack.append((blocker, iter(blocked_by.get(blocker, ()))))
+    return([])
+
+##################################################
+
+
+# STALLED
+##################################################
+# raised when boarding is stopped; report = {"reason", "ticks", "seconds", "zone", "seated", "waiting", "stuck", "cycle"}
+# reason is "deadlock", "stall", "tick budget" or "time budget"; stuck = [{"seat", "coords", "target", "blocked_by"}, ...]
+
+class stalled(Exception):
+
+    def __init__(self, report):
+        super().__init__(f"stall exception: Boarding was stopped after {report['ticks']:.0f} ticks ({report['reason']}), with {len(report['stuck'])} passengers stuck in zone {report['zone']}.")
+        self.report = report
+
+##################################################
+
+
+# WATCHDOG
+##################################################
+# ex. # watch = watchdog(stall_ticks = 1000, max_ticks = 100000, max_seconds = 60)
+#     ... after every tick: watch.check(ticks = ticks, progressed = progressed, describe = lambda: {...})
+
+class watchdog:
+
+    def __init__(self, stall_ticks = 1000, max_ticks = None, max_seconds = None):
+        self.stall_ticks = stall_ticks # how many ticks nobody getting anywhere means boarding is stuck
+        self.max_ticks = max_ticks # most ticks boarding can take (None = no limit)
+        self.max_seconds = max_seconds # most wall-clock seconds boarding can take (None = no limit)
+        self.started = perf_counter()
+        self.last_progress = 0 # last tick anyone got anywhere
+
+    # after a tick: progressed is whether anyone got anywhere, deadlocked whether the engine knows nobody ever can again
+    # describe() returns the engine's side of the report: {"zone", "seated", "waiting", "stuck", "blocked_by"}, where blocked_by = {seat: [seat, ...], ...}
+    def check(self, ticks, progressed, describe, deadlocked = False):
+        if progressed:
+            self.last_progress = ticks
+        seconds = perf_counter() - self.started
+        if deadlocked:
+            reason = "deadlock"
+        elif ticks - self.last_progress >= self.stall_ticks:
+            reason = "stall"
+        elif self.max_ticks is not None and ticks >= self.max_ticks:
+            reason = "tick budget"
+        elif self.max_seconds is not None and seconds >= self.max_seconds:
+            reason = "time budget"
+        else:
+            return(None)
+        details = describe()
+        raise stalled(report = {
+            "reason" : reason,
+            "ticks"  : ticks,
+            "seconds": seconds,
+            "zone"   : details["zone"],
+            "seated" : details["seated"],
+            "waiting": details["waiting"],
+            "stuck"  : details["stuck"],
+            "cycle"  : blocking_cycle(blocked_by = details["blocked_by"])
+            })
+
+##################################################
@@ -0,0 +1,30 @@
+# TESTS
+# Shared fixtures: a small plane (two sections, 56 seats), so that every test boards in well under a second.
+
+
+# IMPORTS
+##################################################
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # for the boarding package
+import pytest
+from boarding import plane
+
+##################################################
+
+
+# FIXTURES
+##################################################
+
+# a business section and an economy section with different seat layouts, so the plane has a cross aisle between them
+small_layout = (
+    ("business", "A BC D",   5, 1.80, 1.80),
+    ("economy",  "AB CD EF", 6, 1.60, 1.60)
+    )
+
+@pytest.fixture(scope = "session")
+def cabin():
+    return(plane.build_plane(layout = small_layout).cabin)
+
+##################################################
@@ -0,0 +1,90 @@
+# COLLISION TESTS
+# Every data structure in collision.py has to give the same answers as checking everything, one by one.
+
+
+# IMPORTS
+##################################################
+
+import numpy
+from boarding.collision import point_segment_distances, occupancy_mask, queue_slots, spatial_hash
+
+##################################################
+
+
+# OCCUPANCY MASK
+##################################################
+
+# points all over the plane, and right along the edges of the obstacles, where the mask falls back to an exact test
+def test_occupancy_mask_matches_brute_force(cabin):
+    obstacles = cabin.obstacles
+    generator = numpy.random.default_rng(seed = 0)
+    lower, upper = obstacles.origin, obstacles.origin + (numpy.array(obstacles.shape) * obstacles.resolution)
+    points = generator.uniform(low = lower, high = upper, size = (3000, 2))
+    starts = obstacles.segments[generator.integers(low = 0, high = len(obstacles.segments), size = 3000), :2]
+    points = numpy.concatenate((points, starts + generator.normal(scale = obstacles.reach, size = (3000, 2))), axis = 0)
+    expected = numpy.array([bool(numpy.any(point_segment_distances(point = point, segments = obstacles.segments) < obstacles.reach + obstacles.half_widths)) for point in points])
+    assert numpy.array_equal(obstacles.collides_many(points = points), expected)
+    assert all(obstacles.collides(point = point) == collides for point, collides in zip(points[::10], expected[::10]))
+
+# a single wall, with a point on every side of it
+def test_occupancy_mask_single_wall():
+    obstacles = occupancy_mask(segments = [[0, 0, 10, 0]], half_widths = [0.1], reach = 0.5, resolution = 0.05)
+    assert obstacles.collides(point = (5, 0.55))
+    assert not obstacles.collides(point = (5, 0.65))
+    assert obstacles.collides(point = (-0.5, 0))
+    assert not obstacles.collides(point = (-0.7, 0))
+    assert not obstacles.collides(point = (100, 100)) # outside of the grid
+
+##################################################
+
+
+# QUEUE SLOTS
+##################################################
+
+def test_queue_slots_match_brute_force(cabin):
+    door = cabin.doors[0]
+    distance = 2 * (cabin.passenger_radius + cabin.bounding_box_margin)
+    queue = queue_slots(slots = door.spawning_locs, distance = distance, blocked = door.blocked)
+    slots = numpy.array(door.spawning_locs, dtype = "float64")
+    generator = numpy.random.default_rng(seed = 0)
+    positions = {}
+    for step in range(2000):
+        item = int(generator.integers(low = 0, high = 30))
+        position = slots[generator.integers(low = 0, high = len(slots))] + generator.normal(scale = distance, size = 2)
+        positions[item] = position
+        queue.update(item = item, position = position)
+        if step % 100 == 0:
+            for i, slot in enumerate(slots):
+                anyone = any(numpy.hypot(*(position - slot)) < distance for position in positions.values())
+                assert queue.occupied(i = i) == (queue.blocked[i] or anyone)
+
+##################################################
+
+
+# SPATIAL HASH
+##################################################
+
+def test_spatial_hash_matches_brute_force():
+    generator = numpy.random.default_rng(seed = 0)
+    index = spatial_hash(cell_size = 1.0)
+    items = [object() for _ in range(300)] # items are told apart by identity, like passengers
+    positions = dict(((item, generator.uniform(low = -10, high = 10, size = 2)) for item in items))
+    for item, position in positions.items():
+        index.insert(item = item, position = position)
+    for item in items[::3]: # move a third of them, some into other cells
+        positions[item] = positions[item] + generator.normal(scale = 1.0, size = 2)
+        index.move(item = item, position = positions[item])
+    for item in items[1::7]:
+        index.remove(item = item)
+        del positions[item]
+    assert len(index) == len(positions)
+    for _ in range(200):
+        center, distance = generator.uniform(low = -11, high = 11, size = 2), float(generator.uniform(low = 0.1, high = 3.0))
+        expected = set(item for item, position in positions.items() if numpy.hypot(*(position - center)) < distance)
+        assert set(index.neighbours(position = center, distance = distance)) == expected
+        assert index.occupied(position = center, distance = distance) == (len(expected) > 0)
+        if len(expected) > 0:
+            excluded = next(iter(expected))
+            assert set(index.neighbours(position = center, distance = distance, exclude = excluded)) == expected - {excluded}
+
+##################################################
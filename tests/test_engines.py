@@ -0,0 +1,92 @@
+# ENGINE TESTS
+# Shortcuts the engines take must never change how long boarding takes.
+
+
+# IMPORTS
+##################################################
+
+import numpy
+import pytest
+from boarding import engine, vectorized, monte_carlo
+from boarding.strategies import strategies
+from boarding.release import release_policy
+
+##################################################
+
+
+# SLEEPING
+##################################################
+
+# passengers who can't move sleep until whoever is in their way moves; boarding with everyone trying every tick instead takes just as long
+@pytest.mark.parametrize("strategy", ["random", "wilma", "steffen"])
+def test_sleeping_does_not_change_ticks(cabin, monkeypatch, strategy):
+    sleeps = []
+    sleep = engine.simulation.sleep
+    monkeypatch.setattr(engine.simulation, "sleep", lambda self, passenger, blockers: sleeps.append(passenger) or sleep(self, passenger = passenger, blockers = blockers))
+    asleep = [monte_carlo.board_once(cabin = cabin, zones = None, seed = seed, strategy = strategy) for seed in range(3)]
+    assert len(sleeps) > 0 # or there is nothing to compare
+    monkeypatch.setattr(engine.simulation, "sleep", lambda self, passenger, blockers: None)
+    awake = [monte_carlo.board_once(cabin = cabin, zones = None, seed = seed, strategy = strategy) for seed in range(3)]
+    assert asleep == awake
+
+##################################################
+
+
+# ENGINES
+##################################################
+
+# every engine boards every built-in strategy to the end
+@pytest.mark.parametrize("strategy", list(strategies))
+def test_every_engine_finishes(cabin, strategy):
+    for vectorized_ticks, discrete_events in ((False, False), (True, False), (False, True)):
+        ticks = monte_carlo.board_once(cabin = cabin, zones = None, seed = 0, strategy = strategy, vectorized_ticks = vectorized_ticks, discrete_events = discrete_events)
+        assert numpy.isfinite(ticks) and ticks > 0
+
+# the vectorized engine only measures moves against nearby passengers, which has to find exactly who is close
+def test_vectorized_close_pairs_match_brute_force(cabin):
+    simulation = vectorized.simulation(cabin = cabin)
+    generator = numpy.random.default_rng(seed = 0)
+    for _ in range(50):
+        points, others = generator.uniform(low = 0, high = 20, size = (40, 2)), generator.uniform(low = 0, high = 20, size = (120, 2))
+        k, l = simulation.close_pairs(points = points, others = others, distance = 1.5)
+        distances = numpy.hypot(points[:, numpy.newaxis, 0] - others[numpy.newaxis, :, 0], points[:, numpy.newaxis, 1] - others[numpy.newaxis, :, 1])
+        assert set(zip(k.tolist(), l.tolist())) == set(zip(*map(lambda indices: indices.tolist(), numpy.nonzero(distances < 1.5))))
+
+##################################################
+
+
+# RELEASE POLICIES
+##################################################
+
+# zones of 10, 10 and 5 passengers
+zone_ends = [10, 20, 25]
+
+def test_barrier_waits_for_everyone():
+    policy = release_policy("barrier")
+    assert policy.release(ticks = 0, released = 10, seated = 9, zone_ends = zone_ends) == 10
+    assert policy.release(ticks = 0, released = 10, seated = 10, zone_ends = zone_ends) == 20
+
+def test_overlap_waits_for_all_but_a_few():
+    policy = release_policy("overlap", 3)
+    assert policy.release(ticks = 0, released = 10, seated = 6, zone_ends = zone_ends) == 10
+    assert policy.release(ticks = 0, released = 10, seated = 7, zone_ends = zone_ends) == 20
+
+def test_interval_calls_a_zone_every_so_often():
+    policy = release_policy("interval", 100)
+    assert policy.release(ticks = 0, released = 0, seated = 0, zone_ends = zone_ends) == 10
+    assert policy.release(ticks = 99, released = 10, seated = 0, zone_ends = zone_ends) == 10
+    assert policy.release(ticks = 100, released = 10, seated = 0, zone_ends = zone_ends) == 20
+
+def test_pacing_lets_one_through_at_a_time():
+    policy = release_policy("pacing", 5)
+    assert policy.release(ticks = 0, released = 0, seated = 0, zone_ends = zone_ends) == 1
+    assert policy.release(ticks = 4, released = 1, seated = 0, zone_ends = zone_ends) == 1
+    assert policy.release(ticks = 5, released = 1, seated = 0, zone_ends = zone_ends) == 2
+    assert policy.release(ticks = 100, released = 25, seated = 0, zone_ends = zone_ends) == 25
+
+# the barrier is what boarding zone after zone does anyway
+def test_barrier_is_zone_after_zone(cabin):
+    zones = [list(cabin.seat_list[i:(i + 12)]) for i in range(0, len(cabin.seat_list), 12)]
+    assert monte_carlo.board_once(cabin = cabin, zones = zones, seed = 0) == monte_carlo.board_once(cabin = cabin, zones = zones, seed = 0, release = "barrier")
+
+##################################################
@@ -0,0 +1,50 @@
+# ESTIMATE TESTS
+# Blocking chains are longest non-decreasing subsequences, and estimates rank boarding orders like simulations do.
+
+
+# IMPORTS
+##################################################
+
+from itertools import combinations
+import numpy
+from boarding import monte_carlo
+from boarding.estimate import blocking_chain, estimator
+from boarding.strategies import boarding_plan, zones_from_plan
+from boarding.population import generator
+
+##################################################
+
+
+# BLOCKING CHAINS
+##################################################
+
+# longest non-decreasing subsequence, by trying every subsequence
+def longest_chain(keys):
+    for length in range(len(keys), 0, -1):
+        if any(all(a <= b for a, b in zip(chain, chain[1:])) for chain in combinations(keys, length)):
+            return(length)
+    return(0)
+
+def test_blocking_chain_matches_brute_force():
+    random = numpy.random.default_rng(seed = 0)
+    for _ in range(200):
+        keys = random.integers(low = 0, high = 6, size = int(random.integers(low = 0, high = 10))).tolist()
+        assert blocking_chain(keys) == longest_chain(keys)
+    assert blocking_chain([3, 2, 1]) == 1 # front to back: nobody is held up by anyone ahead of them
+    assert blocking_chain([1, 2, 2, 3]) == 4 # back to front within a zone: everyone is
+
+##################################################
+
+
+# ESTIMATOR
+##################################################
+
+# the estimate is built from the same boarding orders the simulation boards, and has to put them in much the same order
+def test_estimate_ranks_like_the_simulation(cabin):
+    names = ("front_to_back", "back_to_front", "reverse_pyramid", "wilma", "random", "steffen")
+    boardings = [zones_from_plan(plan = boarding_plan(name, cabin = cabin, generator = generator(seed = 0, stream = "arrival"))) for name in names]
+    times = [monte_carlo.board_once(cabin = cabin, zones = None, seed = 0, strategy = name) for name in names]
+    comparison = estimator(cabin = cabin).compare(boardings = boardings, times = times)
+    assert comparison["rank_correlation"] > 0.5
+
+##################################################
@@ -0,0 +1,84 @@
+# MONTE CARLO TESTS
+# Many boardings: the same whatever the number of processes, summarized honestly when some were stopped.
+
+
+# IMPORTS
+##################################################
+
+import numpy
+import pytest
+from boarding import monte_carlo
+
+##################################################
+
+
+# RUNNER
+##################################################
+
+# every run is fully determined by its seed, so how many processes board them doesn't matter
+def test_processes_do_not_change_results(cabin):
+    serial = monte_carlo.run(cabin = cabin, strategy = "random", n_runs = 6, processes = 1)
+    pooled = monte_carlo.run(cabin = cabin, strategy = "random", n_runs = 6, processes = 2)
+    assert numpy.array_equal(serial["times"], pooled["times"])
+    assert numpy.array_equal(serial["seeds"], pooled["seeds"])
+    assert serial["mean"] == pooled["mean"]
+
+##################################################
+
+
+# SUMMARIES
+##################################################
+
+def test_summarize():
+    results = monte_carlo.summarize(times = [1, 2, 3, 4], confidence = 0.95)
+    assert results["n_runs"] == 4
+    assert results["mean"] == pytest.approx(2.5)
+    assert results["std"] == pytest.approx(numpy.std([1, 2, 3, 4], ddof = 1))
+    assert results["ci"][0] == pytest.approx(2.5 - (1.959964 * results["std"] / 2), rel = 1e-5)
+    assert results["ci"][1] == pytest.approx(2.5 + (1.959964 * results["std"] / 2), rel = 1e-5)
+    assert (results["min"], results["max"]) == (1, 4)
+
+# stopped runs are left out, but the summary says how many there were, and that its mean can't be trusted
+def test_collect_flags_stopped_runs():
+    report = {"reason": "tick budget"}
+    results = monte_carlo.collect(outcomes = [(10, None), (numpy.nan, report), (12, None), (numpy.nan, report)], seeds = [0, 1, 2, 3])
+    assert results["n_runs"] == 2 and results["mean"] == pytest.approx(11)
+    assert results["seeds"].tolist() == [0, 2]
+    assert results["stall_fraction"] == pytest.approx(0.5)
+    assert not results["reliable"]
+    assert monte_carlo.collect(outcomes = [(10, None), (12, None)], seeds = [0, 1])["reliable"]
+
+# the paired difference is seed by seed, and only reliable if both sides are
+def test_paired():
+    results = monte_carlo.collect(outcomes = [(10, None), (20, None), (30, None)], seeds = [0, 1, 2])
+    other = monte_carlo.collect(outcomes = [(9, None), (18, None), (numpy.nan, {"reason": "tick budget"})], seeds = [0, 1, 2])
+    difference = monte_carlo.paired(results = results, other = other)
+    assert difference["seeds"].tolist() == [0, 1]
+    assert difference["times"].tolist() == [1, 2]
+    assert not difference["reliable"]
+    assert monte_carlo.paired(results = results, other = results)["reliable"]
+
+##################################################
+
+
+# SEQUENTIAL
+##################################################
+
+def test_sequential_ranks_and_gives_up(cabin):
+    scenarios = {"random": {"strategy": "random"}, "front_to_back": {"strategy": "front_to_back"}}
+    results = monte_carlo.sequential(cabin = cabin, scenarios = scenarios, batch = 5, max_runs = 20, processes = 1)
+    assert results["random"]["settled"] and results["front_to_back"]["settled"] # far apart, so one batch is enough
+    assert results["random"]["n_runs"] == 5
+    assert results["random"]["confidence"] == pytest.approx(1 - (0.05 / 4)) # split across the 4 batches there could have been
+
+    # with a budget of 5 ticks, no boarding ever finishes
+    results = monte_carlo.sequential(cabin = cabin, scenarios = scenarios, batch = 5, max_runs = 20, processes = 1, max_ticks = 5)
+    for name in scenarios:
+        assert results[name]["gave_up"] and not results[name]["settled"]
+        assert len(results[name]["stalled"]) == 5
+
+def test_sequential_needs_a_way_to_stop(cabin):
+    with pytest.raises(Exception, match = "stopping exception"):
+        monte_carlo.sequential(cabin = cabin, scenarios = {"random": {"strategy": "random"}}, ranking = False)
+
+##################################################
@@ -0,0 +1,62 @@
+# RESULTS TESTS
+# Runs that were stored before are looked up rather than boarded again, under keys that tell scenarios apart.
+
+
+# IMPORTS
+##################################################
+
+import numpy
+from boarding import monte_carlo
+from boarding.results import store, scenario_key
+
+##################################################
+
+
+# STORE
+##################################################
+
+# the second time around, every run is looked up, so nothing is boarded
+def test_store_skips_stored_runs(cabin):
+    runs = store(path = ":memory:")
+    monte_carlo.initialize_worker(cabin = cabin)
+    boarded = []
+    boarder = lambda function, tasks: (boarded.extend(tasks) or list(map(function, tasks)))
+    tasks = [monte_carlo.task(zones = None, seed = seed, strategy = "random") for seed in range(4)]
+    first = monte_carlo.board_tasks(cabin = cabin, tasks = tasks, boarder = boarder, store = runs)
+    assert len(boarded) == 4 and len(runs) == 4
+    second = monte_carlo.board_tasks(cabin = cabin, tasks = tasks, boarder = boarder, store = runs)
+    assert len(boarded) == 4 # nothing new
+    assert first == second
+
+    # only the new seeds are boarded
+    more_tasks = [monte_carlo.task(zones = None, seed = seed, strategy = "random") for seed in range(6)]
+    monte_carlo.board_tasks(cabin = cabin, tasks = more_tasks, boarder = boarder, store = runs)
+    assert [task[1] for task in boarded[4:]] == [4, 5]
+    runs.close()
+
+# a run stopped for going over its budget of seconds depends on the machine, so it is never stored; other stops are
+def test_store_keeps_stops_but_not_time_budgets(cabin):
+    runs = store(path = ":memory:")
+    tasks = [monte_carlo.task(zones = None, seed = seed, strategy = "random") for seed in range(2)]
+    runs.save(cabin = cabin, tasks = tasks, outcomes = [(numpy.nan, {"reason": "time budget"}), (numpy.nan, {"reason": "deadlock"})])
+    first, second = runs.lookup(cabin = cabin, tasks = tasks)
+    assert first is None
+    assert numpy.isnan(second[0]) and second[1]["reason"] == "deadlock"
+    runs.close()
+
+##################################################
+
+
+# KEYS
+##################################################
+
+def test_scenario_keys(cabin):
+    key = lambda **parameters: scenario_key(cabin = cabin, task = monte_carlo.task(**dict({"zones": None, "seed": 0, "strategy": "random"}, **parameters)))
+    assert key() == key(seed = 1) # the seed is stored next to the key
+    assert key() == key(traits = {"luggage_ticks": 0}) # no luggage is the same as luggage taking 0 ticks
+    assert key() == key(max_seconds = 10) # finished runs don't depend on their budget of seconds
+    different = [key(), key(strategy = "wilma"), key(vectorized_ticks = True), key(discrete_events = True), key(max_ticks = 100), key(release = "overlap", release_values = (10, )),
+                 key(discrete_events = True, traits = {"luggage_ticks": 20}), key(strategy = None, zones = [list(cabin.seat_list)])]
+    assert len(set(different)) == len(different)
+
+##################################################